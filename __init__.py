@@ -2,4 +2,5 @@
 
 from . import controllers
 from . import models
-from . import  services
\ No newline at end of file
+from . import  services
+from .hooks import post_init_hook
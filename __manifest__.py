@@ -2,15 +2,18 @@
 {
     "name": "PSN - API",
     "summary": "PSN - API for MRP Product weight",
-    "version": "15.0.1.0.0",
+    "version": "15.0.1.0.1",
     "category": "Ozone/Ozone",
     "website": "https://www.psn.co.th",
     "author": "Chakkrit Jansopanakul",
     "license": "LGPL-3",
     "installable": True,
-    "depends": ['base', 'mrp_request', 'sale'],
+    "depends": ['base', 'mrp_request', 'sale', 'hotel_reservation'],
     "data": [
         'security/ir.model.access.csv',
+        'data/ir_sequence_data.xml',
+        'data/ir_cron_data.xml',
     ],
+    "post_init_hook": "post_init_hook",
 
 }
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""Standalone benchmarks for the psn_api services.
+
+Not loaded by Odoo; run the scripts with ``python -m benchmarks.<name>``
+from the addon directory.
+"""
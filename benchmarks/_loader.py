@@ -0,0 +1,59 @@
+"""Import single service modules without an Odoo server.
+
+The ``services`` package ``__init__`` pulls in every service, including the
+ORM-bound ones, so benchmarks load the modules they need one by one under a
+synthetic package. When Odoo is not installed a minimal ``odoo.http``
+module with a stubbed ``request`` is registered first.
+"""
+import importlib
+import os
+import sys
+import types
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES_PACKAGE = "_psn_api_services"
+
+
+class StubResponse:
+
+    def __init__(self, body, headers=None):
+        self.body = body if isinstance(body, bytes) else body.encode("utf-8")
+        self.headers = headers or []
+        self.status_code = 200
+
+    def get_data(self, as_text=False):
+        return self.body.decode("utf-8") if as_text else self.body
+
+
+class StubRequest:
+
+    env = None
+
+    @staticmethod
+    def make_response(body, headers=None, status=None):
+        return StubResponse(body, headers)
+
+
+def install_odoo_stub():
+    try:
+        import odoo.http  # noqa: F401
+        return False
+    except ImportError:
+        pass
+    odoo = types.ModuleType("odoo")
+    odoo.__path__ = []
+    http = types.ModuleType("odoo.http")
+    http.request = StubRequest()
+    odoo.http = http
+    sys.modules.setdefault("odoo", odoo)
+    sys.modules.setdefault("odoo.http", http)
+    return True
+
+
+def load_service(name):
+    install_odoo_stub()
+    if SERVICES_PACKAGE not in sys.modules:
+        package = types.ModuleType(SERVICES_PACKAGE)
+        package.__path__ = [os.path.join(ADDON_DIR, "services")]
+        sys.modules[SERVICES_PACKAGE] = package
+    return importlib.import_module(f"{SERVICES_PACKAGE}.{name}")
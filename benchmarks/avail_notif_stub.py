@@ -0,0 +1,83 @@
+"""Local stand-in for the channel's OTA_HotelAvailNotifRQ endpoint.
+
+Accepts availability pushes, prints one line per message (ranges and the
+room types they cover) and answers with an OTA ``Success``, or an
+``Errors`` element for a share of requests with ``--fail-rate``. Point
+``psn_api.availability_push_url`` at it::
+
+    python -m benchmarks.avail_notif_stub --port 8099 --fail-rate 0.1
+"""
+import argparse
+import random
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_RANGE = re.compile(rb'<StatusApplicationControl Start="([^"]*)" End="([^"]*)" InvTypeCode="([^"]*)"')
+_ECHO_TOKEN = re.compile(rb'EchoToken="([^"]*)"')
+
+_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">
+    <SOAP-ENV:Body>
+        <OTA_HotelAvailNotifRS xmlns="http://www.opentravel.org/OTA/2003/05" Version="1.0" EchoToken="{echo_token}">{content}
+        </OTA_HotelAvailNotifRS>
+    </SOAP-ENV:Body>
+</SOAP-ENV:Envelope>"""
+_SUCCESS = "\n            <Success/>"
+_ERROR = '\n            <Errors><Error Type="12" Code="450">Stub failure</Error></Errors>'
+
+
+class AvailNotifHandler(BaseHTTPRequestHandler):
+
+    fail_rate = 0.0
+    totals = {"requests": 0, "ranges": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        ranges = _RANGE.findall(body)
+        echo_token = _ECHO_TOKEN.search(body)
+        failed = random.random() < self.fail_rate
+        with self.lock:
+            self.totals["requests"] += 1
+            self.totals["ranges"] += len(ranges)
+            self.totals["failed"] += failed
+            totals = dict(self.totals)
+        room_types = sorted({inv_type_code.decode() for start, end, inv_type_code in ranges})
+        print(f"{len(body)} bytes, {len(ranges)} ranges, room types {', '.join(room_types)}"
+              f"{' -> rejected' if failed else ''} (totals {totals})", flush=True)
+
+        response = _RESPONSE.format(
+            echo_token=echo_token.group(1).decode() if echo_token else "",
+            content=_ERROR if failed else _SUCCESS,
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    AvailNotifHandler.fail_rate = args.fail_rate
+    server = ThreadingHTTPServer((args.host, args.port), AvailNotifHandler)
+    print(f"Listening on http://{args.host}:{args.port}/", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
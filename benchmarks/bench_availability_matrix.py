@@ -0,0 +1,54 @@
+"""Fill of the availability matrix, NumPy against the list fallback.
+
+Times the room × night array build and per-type counts for synthetic
+occupancy (the SQL fetch is not included). Without NumPy only the list
+fallback is timed.
+
+Usage: python -m benchmarks.bench_availability_matrix [--rooms 200] [--nights 90] [--occupancy 0.7]
+"""
+import argparse
+import random
+import timeit
+
+from ._loader import load_service
+
+availability_Matrix = load_service("availability_Matrix")
+AvailabilityMatrixService = availability_Matrix.AvailabilityMatrixService
+
+
+def synthetic(rooms_count, nights, occupancy, rooms_per_type=20, seed=7):
+    rng = random.Random(seed)
+    rooms = [
+        {'id': 1000 + index, 'name': f"R{index:04d}", 'room_categ_id': (index // rooms_per_type, f"Type {index // rooms_per_type:03d}")}
+        for index in range(rooms_count)
+    ]
+    taken = [(room['id'], offset) for room in rooms for offset in range(nights) if rng.random() < occupancy]
+    return rooms, ([room_id for room_id, offset in taken], [offset for room_id, offset in taken])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--nights", type=int, default=90)
+    parser.add_argument("--occupancy", type=float, default=0.7)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    rooms, booked = synthetic(args.rooms, args.nights, args.occupancy)
+    starts = AvailabilityMatrixService._type_starts(rooms)
+    fills = [("lists", AvailabilityMatrixService._fill_lists)]
+    if availability_Matrix.np is not None:
+        fills.insert(0, ("numpy", AvailabilityMatrixService._fill_numpy))
+        assert AvailabilityMatrixService._fill_numpy(rooms, starts, args.nights, booked) == \
+            AvailabilityMatrixService._fill_lists(rooms, starts, args.nights, booked)
+    else:
+        print("numpy is not installed, timing the list fallback only")
+
+    print(f"{args.rooms} rooms x {args.nights} nights, {len(booked[0])} taken room nights")
+    for name, fill in fills:
+        seconds = min(timeit.repeat(lambda: fill(rooms, starts, args.nights, booked), number=args.number, repeat=3))
+        print(f"{name:<8}{seconds / args.number * 1000:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
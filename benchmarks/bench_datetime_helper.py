@@ -0,0 +1,54 @@
+"""DateTimeHelper against the strptime-based helper it replaced.
+
+Usage: python -m benchmarks.bench_datetime_helper [--number N]
+"""
+import argparse
+import timeit
+from datetime import datetime
+
+from . import legacy_datetime_helper as legacy
+from ._loader import load_service
+
+dataTime_Service = load_service("dataTime_Service")
+DateTimeHelper = dataTime_Service.DateTimeHelper
+
+INPUTS = {
+    "iso": "2026-03-07",
+    "non_canonical": "2026/3/7",
+    "invalid": "2026-13-40",
+}
+
+
+def check_equivalence():
+    for value in list(INPUTS.values()) + ["", " 2026-03-07 ", "2026-3-17", "20260307", "2026-W10-6"]:
+        for time_string in ("00:00:00", "23:59:59"):
+            expected = legacy.DateTimeHelper.parse_and_format_datetime(value, time_string)
+            actual = DateTimeHelper.parse_and_format_datetime(value, time_string)
+            assert expected == actual, (value, time_string, expected, actual)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    check_equivalence()
+    print(f"{'input':<16}{'call':<28}{'legacy ns':>11}{'current ns':>12}{'speedup':>9}")
+    current_time = datetime.now().time().replace(microsecond=0)
+    for name, value in INPUTS.items():
+        cases = (
+            ("time string", lambda: legacy.DateTimeHelper.parse_and_format_datetime(value, "14:30:00"),
+             lambda: DateTimeHelper.parse_and_format_datetime(value, "14:30:00")),
+            # What the reservation service did before: format the clock, then parse it again.
+            ("now().strftime vs time", lambda: legacy.DateTimeHelper.parse_and_format_datetime(
+                value, datetime.now().strftime("%H:%M:%S")),
+             lambda: DateTimeHelper.parse_and_format_datetime(value, current_time)),
+        )
+        for label, legacy_func, current_func in cases:
+            legacy_ns = min(timeit.repeat(legacy_func, number=args.number, repeat=3)) / args.number * 1e9
+            current_ns = min(timeit.repeat(current_func, number=args.number, repeat=3)) / args.number * 1e9
+            print(f"{name:<16}{label:<28}{legacy_ns:>11.0f}{current_ns:>12.0f}{legacy_ns / current_ns:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Throughput, latency percentiles and peak memory of the parsing and extraction services.
+
+Every service is timed in isolation on synthetic documents (see
+``benchmarks.synthetic``), without an Odoo server; ``odoo.http.request`` is
+stubbed when Odoo is not installed.
+
+Usage::
+
+    python -m benchmarks.bench_pipeline --save-baseline     # record benchmarks/baseline.json
+    python -m benchmarks.bench_pipeline                     # compare against it
+    python -m benchmarks.bench_pipeline --reservations 20 --room-stays 3 --max-regression 15
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from ._loader import load_service
+from .synthetic import generate_document
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _load(name):
+    try:
+        return load_service(name)
+    except ImportError as e:
+        print(f"skipping {name}: {e}", file=sys.stderr)
+        return None
+
+
+def build_cases(args):
+    soap_parser = _load("soap_Parser")
+    xml_parsing = _load("xml_Parsing")
+    cus_data_extractor = _load("cus_Data_Extractor")
+    room_stay_extractor_module = _load("room_stay_Extractor")
+    datetime_service = _load("dataTime_Service")
+    response_builder_module = _load("responseBuilder")
+    if soap_parser is None or room_stay_extractor_module is None:
+        # Every case runs on the parsed document and the extracted stays.
+        raise SystemExit("soap_Parser and room_stay_Extractor are required to build the documents")
+    room_stay_extractor = room_stay_extractor_module.RoomStayExtractor
+
+    document = generate_document(args.reservations, args.room_stays, args.room_types, args.guests, args.seed)
+    parse_data = soap_parser.SoapParsingEngine().parse(document)
+    hotel_reservations = parse_data["ota_request"]["HotelReservations"]["HotelReservation"]
+    if not isinstance(hotel_reservations, list):
+        hotel_reservations = [hotel_reservations]
+    dates = [
+        room_type["checkin_date"]
+        for reservation in hotel_reservations
+        for room_type in room_stay_extractor.extract_room_stay_info(reservation)["room_types"]
+    ]
+    results = [
+        {"success": True, "siteminder_id": f"SM{index:08d}", "reservation_no": f"R/{index:05d}", "warnings": []}
+        for index in range(len(hotel_reservations))
+    ]
+
+    cases = {
+        "soap_parser.etree": lambda: soap_parser.SoapParsingEngine("etree").parse(document),
+        "room_stay_extractor": lambda: [
+            room_stay_extractor.extract_room_stay_info(reservation) for reservation in hotel_reservations
+        ],
+    }
+    if soap_parser.lxml_etree is not None:
+        cases["soap_parser.lxml"] = lambda: soap_parser.SoapParsingEngine("lxml").parse(document)
+    if cus_data_extractor is not None:
+        customer_extractor = cus_data_extractor.CustomerDataExtractor
+        cases["customer_extractor"] = lambda: [
+            customer_extractor.extract_customer_info(reservation) for reservation in hotel_reservations
+        ]
+    if datetime_service is not None:
+        datetime_helper = datetime_service.DateTimeHelper
+        cases["datetime_helper"] = lambda: [
+            datetime_helper.parse_and_format_datetime(value, "00:00:00") for value in dates
+        ]
+    if response_builder_module is not None:
+        response_builder = response_builder_module.ResponseBuilder
+        cases["response_builder"] = lambda: response_builder.render_batch(results, parse_data)
+    if xml_parsing is not None:
+        xml_service = xml_parsing.XmlParsingService
+        cases["xml_parsing.parse_soap_message"] = lambda: xml_service.parse_soap_message(document)
+        cases["xml_parsing.extract_reservations_data"] = lambda: xml_service.extract_reservations_data(parse_data)
+    return cases, len(document)
+
+
+def run_case(func, iterations, warmup):
+    for _ in range(warmup):
+        func()
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        started = clock()
+        func()
+        samples.append(clock() - started)
+
+    # Measured apart from the timings: tracemalloc slows every allocation down.
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "ops_per_sec": 1e9 * len(samples) / sum(samples),
+        "p50_us": quantiles[49] / 1000,
+        "p95_us": quantiles[94] / 1000,
+        "p99_us": quantiles[98] / 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def _delta(current, baseline):
+    if not baseline:
+        return ""
+    return f"{100.0 * (current - baseline) / baseline:+.1f}%"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reservations", type=int, default=5)
+    parser.add_argument("--room-stays", type=int, default=2)
+    parser.add_argument("--room-types", type=int, default=1)
+    parser.add_argument("--guests", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="exit non-zero when a p50 is this many percent slower than the baseline")
+    args = parser.parse_args(argv)
+
+    cases, document_size = build_cases(args)
+    shape = {
+        "reservations": args.reservations,
+        "room_stays": args.room_stays,
+        "room_types": args.room_types,
+        "guests": args.guests,
+    }
+    print(f"document: {document_size} bytes, {shape}")
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            stored = json.load(baseline_file)
+        if stored.get("shape") == shape:
+            baseline = stored["cases"]
+        else:
+            print(f"baseline shape {stored.get('shape')} differs, not comparing")
+
+    print(f"{'case':<42}{'ops/s':>11}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'peak KiB':>10}{'p50 vs base':>13}")
+    measured = {}
+    regressions = []
+    for name, func in cases.items():
+        stats = measured[name] = run_case(func, args.iterations, args.warmup)
+        base = baseline.get(name, {})
+        delta = _delta(stats["p50_us"], base.get("p50_us"))
+        print(f"{name:<42}{stats['ops_per_sec']:>11.0f}{stats['p50_us']:>10.1f}{stats['p95_us']:>10.1f}"
+              f"{stats['p99_us']:>10.1f}{stats['peak_kib']:>10.1f}{delta:>13}")
+        if (args.max_regression is not None and base.get("p50_us")
+                and stats["p50_us"] > base["p50_us"] * (1 + args.max_regression / 100)):
+            regressions.append(name)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump({"shape": shape, "python": sys.version.split()[0], "cases": measured},
+                      baseline_file, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+
+    if regressions:
+        print(f"p50 regressed by more than {args.max_regression}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""The f-string ResponseBuilder the precompiled templates replaced, kept as a baseline."""
+import uuid
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+
+def _echo_token(parse_data):
+    return parse_data.get('echo_token') or str(uuid.uuid4())
+
+
+def _success(echo_token, reservation_no, warnings_xml=""):
+    current_timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">
+    <SOAP-ENV:Body>
+        <OTA_HotelResNotifRS xmlns="http://www.opentravel.org/OTA/2003/05"
+             Version="1.0" TimeStamp="{current_timestamp}" EchoToken="{echo_token}">
+            <Success/>{warnings_xml}
+            <HotelReservations>
+                <HotelReservation>
+                    <UniqueID ID="{reservation_no}"/>
+                    <ResGlobalInfo>
+                        <HotelReservationIDs>
+                            <HotelReservationID ResID_Type="10"
+                                 ResID_Value="{reservation_no}"/>
+                        </HotelReservationIDs>
+                    </ResGlobalInfo>
+                </HotelReservation>
+            </HotelReservations>
+        </OTA_HotelResNotifRS>
+    </SOAP-ENV:Body>
+</SOAP-ENV:Envelope>"""
+
+
+def render_success(reservation_result, parse_data):
+    return _success(_echo_token(parse_data), reservation_result.get('reservation_no', '')).encode('utf-8')
+
+
+def render_success_with_warnings(reservation_result, parse_data, warnings):
+    warnings_xml = ""
+    if warnings:
+        warnings_xml = "\n            <Warnings>"
+        for warning in warnings:
+            warnings_xml += f'\n                <Warning Type="{warning["type"]}" Code="{warning["code"]}">{warning["message"]}</Warning>'
+        warnings_xml += "\n            </Warnings>"
+    return _success(_echo_token(parse_data), reservation_result.get('reservation_no', ''), warnings_xml).encode('utf-8')
+
+
+def render_error(error_message, error_info, parse_data):
+    echo_token = _echo_token(parse_data)
+    current_timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">
+    <SOAP-ENV:Body>
+        <OTA_HotelResNotifRS xmlns="http://www.opentravel.org/OTA/2003/05"
+             Version="1.0" TimeStamp="{current_timestamp}" EchoToken="{echo_token}">
+            <Errors>
+                <Error Type="{error_info['Type']}" Code="{error_info['Code']}">{error_message}</Error>
+            </Errors>
+        </OTA_HotelResNotifRS>
+    </SOAP-ENV:Body>
+</SOAP-ENV:Envelope>""".encode('utf-8')
+
+
+def render_authentication_error(error_message):
+    return render_error(error_message, {'Type': '1', 'Code': '401'}, {})
+
+
+def render_batch(results, parse_data, error_mapping):
+    echo_token = _echo_token(parse_data)
+    current_timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    any_success = any(result.get('success') for result in results)
+    notices = []
+    reservations = []
+    for rph, result in enumerate(results, start=1):
+        siteminder_id = escape(str(result.get('siteminder_id') or ''), {'"': '&quot;'})
+        if result.get('success'):
+            reservation_no = escape(str(result.get('reservation_no') or ''), {'"': '&quot;'})
+            for warning in result.get('warnings', []):
+                notices.append(
+                    f'<Warning Type="{warning["type"]}" Code="{warning["code"]}" RPH="{rph}">'
+                    f'{escape(warning["message"])}</Warning>'
+                )
+            reservations.append(f"""
+                <HotelReservation>
+                    <UniqueID ID="{reservation_no}"/>
+                    <ResGlobalInfo>
+                        <HotelReservationIDs>
+                            <HotelReservationID ResID_Type="14"
+                                 ResID_Value="{siteminder_id}"/>
+                            <HotelReservationID ResID_Type="10"
+                                 ResID_Value="{reservation_no}"/>
+                        </HotelReservationIDs>
+                    </ResGlobalInfo>
+                </HotelReservation>""")
+        else:
+            error_info = error_mapping.get(result.get('error_type'), error_mapping['unknown_error'])
+            tag = 'Warning' if any_success else 'Error'
+            notices.append(
+                f'<{tag} Type="{error_info["Type"]}" Code="{error_info["Code"]}" RPH="{rph}">'
+                f'{escape(str(result.get("error") or "Unknown error occurred"))}</{tag}>'
+            )
+            reservations.append(f"""
+                <HotelReservation ResStatus="Rejected">
+                    <ResGlobalInfo>
+                        <HotelReservationIDs>
+                            <HotelReservationID ResID_Type="14"
+                                 ResID_Value="{siteminder_id}"/>
+                        </HotelReservationIDs>
+                    </ResGlobalInfo>
+                </HotelReservation>""")
+
+    notices_xml = "".join(f"\n                {notice}" for notice in notices)
+    if any_success:
+        status_xml = "<Success/>"
+        if notices:
+            status_xml += f"\n            <Warnings>{notices_xml}\n            </Warnings>"
+    else:
+        status_xml = f"<Errors>{notices_xml}\n            </Errors>"
+
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">
+    <SOAP-ENV:Body>
+        <OTA_HotelResNotifRS xmlns="http://www.opentravel.org/OTA/2003/05"
+             Version="1.0" TimeStamp="{current_timestamp}" EchoToken="{echo_token}">
+            {status_xml}
+            <HotelReservations>{"".join(reservations)}
+            </HotelReservations>
+        </OTA_HotelResNotifRS>
+    </SOAP-ENV:Body>
+</SOAP-ENV:Envelope>""".encode('utf-8')
@@ -0,0 +1,255 @@
+"""End-to-end load and concurrency harness for /api/reservation.
+
+Replays SiteMinder-like traffic against a running Odoo and reports latency
+percentiles, the OTA error-code mix and serialization failures. Traffic
+mixes new bookings, modifications of already sent ResIDs and new bookings
+that compete for a few "hot" rooms with overlapping dates, which is where
+room line creation, reservation numbering and room status writes contend.
+
+The room inventory is seeded over XML-RPC (``--login``/``--password``); the
+API key of the SiteMinder user has to be created beforehand in Odoo.
+
+Usage::
+
+    python -m benchmarks.load_harness --api-key KEY --db hotel --login admin --password admin \\
+        --requests 500 --concurrency 16 --mix new=0.5,modify=0.3,overlap=0.2 --odoo-log /var/log/odoo.log
+"""
+import argparse
+import collections
+import itertools
+import os
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import xmlrpc.client
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from .synthetic import envelope, hotel_reservation
+
+ROOM_PREFIX = "LOAD"
+ROOM_TYPE_PREFIX = "Load Type"
+
+_NOTICE = re.compile(rb'<(Error|Warning) Type="([^"]*)" Code="([^"]*)"')
+_SERIALIZATION = re.compile(rb"could not serialize|concurrent update|deadlock detected", re.IGNORECASE)
+_ODOO_RETRY = re.compile(r"SerializationFailure|could not serialize|retrying", re.IGNORECASE)
+
+
+def seed_inventory(url, db, login, password, rooms, room_types):
+    """Create the harness room types and rooms unless they already exist."""
+    common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
+    uid = common.authenticate(db, login, password, {})
+    if not uid:
+        raise SystemExit(f"could not log in to {db} as {login}")
+    models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object", allow_none=True)
+
+    def call(model, method, *args, **kwargs):
+        return models.execute_kw(db, uid, password, model, method, list(args), kwargs)
+
+    room_fields = call("hotel.room", "fields_get", attributes=["type"])
+    type_ids = []
+    for index in range(room_types):
+        name = f"{ROOM_TYPE_PREFIX} {index}"
+        existing = call("hotel.room.type", "search", [("name", "=", name)], limit=1)
+        type_ids.append(existing[0] if existing else call("hotel.room.type", "create", {"name": name}))
+
+    inventory = []
+    for index in range(rooms):
+        name = f"{ROOM_PREFIX}{index:04d}"
+        type_index = index % room_types
+        if not call("hotel.room", "search", [("name", "=", name)], limit=1):
+            vals = {"name": name}
+            if "room_categ_id" in room_fields:
+                vals["room_categ_id"] = type_ids[type_index]
+            if "capacity" in room_fields:
+                vals["capacity"] = 4
+            call("hotel.room", "create", vals)
+        inventory.append((f"{ROOM_TYPE_PREFIX} {type_index}", name))
+    return inventory
+
+
+def default_inventory(rooms, room_types):
+    return [(f"{ROOM_TYPE_PREFIX} {index % room_types}", f"{ROOM_PREFIX}{index:04d}") for index in range(rooms)]
+
+
+class TrafficGenerator:
+    """Build the request bodies; thread-safe because ResIDs are shared across workers."""
+
+    def __init__(self, inventory, mix, hot_rooms, api_key, seed):
+        self.inventory = inventory
+        self.hot_rooms = inventory[:hot_rooms]
+        self.kinds, self.weights = zip(*mix.items())
+        self.api_key = api_key
+        self.rng = random.Random(seed)
+        self.run_id = f"{seed}-{int(time.time())}"
+        self.counter = itertools.count(1)
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def _stay(self, room, start, nights, adults):
+        room_type, room_name = room
+        return room_type, room_name, start, start + timedelta(days=nights), adults
+
+    def next_request(self):
+        with self.lock:
+            kind = self.rng.choices(self.kinds, self.weights)[0]
+            if kind == "modify" and not self.sent:
+                kind = "new"
+            sequence = next(self.counter)
+            if kind == "modify":
+                res_id = self.rng.choice(self.sent)
+            else:
+                res_id = f"LOAD-{self.run_id}-{sequence}"
+                self.sent.append(res_id)
+            if kind == "overlap":
+                room = self.rng.choice(self.hot_rooms)
+                start = date.today() + timedelta(days=30 + self.rng.randint(0, 3))
+            else:
+                room = self.rng.choice(self.inventory)
+                start = date.today() + timedelta(days=self.rng.randint(1, 365))
+            stay = self._stay(room, start, self.rng.randint(1, 5), self.rng.randint(1, 3))
+        body = envelope(
+            [hotel_reservation(res_id, [stay], given_name=f"Load{sequence}")],
+            api_key=self.api_key,
+            echo_token=f"load-{self.run_id}-{sequence}",
+        )
+        return kind, body
+
+
+def send(url, body, timeout):
+    request = urllib.request.Request(
+        f"{url}/api/reservation", data=body, headers={"Content-Type": "text/xml; charset=utf-8"}, method="POST"
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, payload = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, payload = e.code, e.read()
+    except (urllib.error.URLError, OSError) as e:
+        status, payload = 0, str(e).encode("utf-8", "replace")
+    return time.perf_counter() - started, status, payload
+
+
+def classify(status, payload):
+    """The outcome label used in the error-code mix."""
+    if status != 200:
+        return f"http_{status}"
+    notices = _NOTICE.findall(payload)
+    errors = [code.decode() for tag, _, code in notices if tag == b"Error"]
+    if errors:
+        return f"error_{errors[0]}"
+    if b"<Success/>" in payload:
+        warnings = sorted({code.decode() for tag, _, code in notices if tag == b"Warning"})
+        return "success" if not warnings else f"success_warn_{'+'.join(warnings)}"
+    return "unparsed"
+
+
+def percentiles(samples):
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return value, value, value
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return quantiles[49] * 1000, quantiles[94] * 1000, quantiles[98] * 1000
+
+
+def _log_size(path):
+    return os.path.getsize(path) if path and os.path.exists(path) else 0
+
+
+def count_log_retries(path, offset):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, errors="replace") as log_file:
+        log_file.seek(offset)
+        return sum(1 for line in log_file if _ODOO_RETRY.search(line))
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        kind, weight = part.split("=")
+        if kind not in ("new", "modify", "overlap"):
+            raise argparse.ArgumentTypeError(f"unknown traffic kind {kind!r}")
+        mix[kind] = float(weight)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8069")
+    parser.add_argument("--api-key", required=True, help="API key of the SiteMinder integration user")
+    parser.add_argument("--db", help="database to seed; seeding is skipped without it")
+    parser.add_argument("--login", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--rooms", type=int, default=40)
+    parser.add_argument("--room-types", type=int, default=4)
+    parser.add_argument("--hot-rooms", type=int, default=3, help="rooms targeted by overlapping requests")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("new=0.5,modify=0.3,overlap=0.2"))
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--odoo-log", help="Odoo log file, to count serialization retries done by the server")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        inventory = seed_inventory(args.url, args.db, args.login, args.password, args.rooms, args.room_types)
+    else:
+        inventory = default_inventory(args.rooms, args.room_types)
+    traffic = TrafficGenerator(inventory, args.mix, max(1, args.hot_rooms), args.api_key, args.seed)
+
+    log_offset = _log_size(args.odoo_log)
+    latencies = collections.defaultdict(list)
+    outcomes = collections.Counter()
+    outcomes_by_kind = collections.defaultdict(collections.Counter)
+    serialization_failures = 0
+    results_lock = threading.Lock()
+
+    def worker(_):
+        nonlocal serialization_failures
+        kind, body = traffic.next_request()
+        elapsed, status, payload = send(args.url, body, args.timeout)
+        outcome = classify(status, payload)
+        with results_lock:
+            latencies[kind].append(elapsed)
+            outcomes[outcome] += 1
+            outcomes_by_kind[kind][outcome] += 1
+            if _SERIALIZATION.search(payload):
+                serialization_failures += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(worker, range(args.requests)))
+    wall_time = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {wall_time:.1f}s, "
+          f"{args.requests / wall_time:.1f} req/s")
+    print(f"{'traffic':<10}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for kind, values in sorted(latencies.items()) + [("all", all_latencies)]:
+        p50, p95, p99 = percentiles(values)
+        print(f"{kind:<10}{len(values):>7}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+
+    print("\noutcome mix")
+    for outcome, count in outcomes.most_common():
+        by_kind = ", ".join(
+            f"{kind} {outcomes_by_kind[kind][outcome]}" for kind in sorted(outcomes_by_kind)
+            if outcomes_by_kind[kind][outcome]
+        )
+        print(f"  {outcome:<28}{count:>7}  ({by_kind})")
+
+    print(f"\nserialization failures returned to the client: {serialization_failures}")
+    retries = count_log_retries(args.odoo_log, log_offset)
+    if retries is not None:
+        print(f"serialization retries in the Odoo log: {retries}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Synthetic SiteMinder OTA_HotelResNotifRQ documents for the benchmarks."""
+import random
+from datetime import date, timedelta
+from xml.sax.saxutils import escape, quoteattr
+
+GIVEN_NAMES = ("Aung", "Hla", "Mya", "Kyaw", "Thandar", "Zaw", "Nilar", "Htet")
+SURNAMES = ("Min", "Oo", "Win", "Thu", "Naing", "Soe", "Lwin", "Aye")
+ROOM_TYPES = ("Deluxe", "Superior", "Family Suite", "Standard Twin")
+
+
+def _guest_counts(rng, guests):
+    adults = max(1, guests - rng.randint(0, guests // 2))
+    children = guests - adults
+    counts = [f'<GuestCount AgeQualifyingCode="10" Count="{adults}"/>']
+    if children:
+        counts.append(f'<GuestCount AgeQualifyingCode="8" Count="{children}"/>')
+    return "".join(counts)
+
+
+def _room_stay(rng, index, room_types, guests, arrival):
+    nights = rng.randint(1, 7)
+    departure = arrival + timedelta(days=nights)
+    types = "".join(
+        f'<RoomType RoomTypeCode="RT{type_index}" RoomType={quoteattr(rng.choice(ROOM_TYPES))} '
+        f'RoomID="{100 + index * room_types + type_index}">'
+        f'<RoomDescription><Text>Room {index}-{type_index}, breakfast &amp; late checkout</Text></RoomDescription>'
+        f'</RoomType>'
+        for type_index in range(room_types)
+    )
+    return (
+        f'<RoomStay><RoomTypes>{types}</RoomTypes>'
+        f'<GuestCounts>{_guest_counts(rng, guests)}</GuestCounts>'
+        f'<TimeSpan Start="{arrival.isoformat()}" End="{departure.isoformat()}"/>'
+        f'</RoomStay>'
+    )
+
+
+def _hotel_reservation(rng, index, room_stays, room_types, guests):
+    arrival = date(2026, 1, 1) + timedelta(days=rng.randint(0, 365))
+    stays = "".join(
+        _room_stay(rng, stay_index, room_types, guests, arrival + timedelta(days=stay_index))
+        for stay_index in range(room_stays)
+    )
+    given, surname = rng.choice(GIVEN_NAMES), rng.choice(SURNAMES)
+    return (
+        f'<HotelReservation CreateDateTime="2026-01-01T00:00:00Z" ResStatus="Book">'
+        f'<RoomStays>{stays}</RoomStays>'
+        f'<ResGlobalInfo>'
+        f'<Total AmountAfterTax="{rng.randint(50, 900)}.00" CurrencyCode="USD"/>'
+        f'<DepositPayments><GuaranteePayment><AmountPercent Percent="{rng.choice((0, 50, 100))}"/>'
+        f'</GuaranteePayment></DepositPayments>'
+        f'<Profiles><ProfileInfo><Profile ProfileType="1"><Customer>'
+        f'<PersonName><GivenName>{escape(given)}</GivenName><Surname>{escape(surname)}</Surname></PersonName>'
+        f'<Telephone PhoneNumber="+95 9 {rng.randint(100000000, 999999999)}"/>'
+        f'<Email>{given.lower()}.{surname.lower()}@example.com</Email>'
+        f'</Customer></Profile></ProfileInfo></Profiles>'
+        f'<HotelReservationIDs><HotelReservationID ResID_Type="14" ResID_Value="SM{index:08d}"/>'
+        f'</HotelReservationIDs>'
+        f'</ResGlobalInfo>'
+        f'</HotelReservation>'
+    )
+
+
+def envelope(hotel_reservations, api_key="benchmark-api-key", echo_token="bench"):
+    """Wrap HotelReservation elements in a SOAP OTA_HotelResNotifRQ, as bytes."""
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">'
+        '<SOAP-ENV:Header><wsse:Security xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/'
+        'oasis-200401-wss-wssecurity-secext-1.0.xsd"><wsse:UsernameToken>'
+        f'<wsse:Username>siteminder</wsse:Username><wsse:Password>{escape(api_key)}</wsse:Password>'
+        '</wsse:UsernameToken></wsse:Security></SOAP-ENV:Header>'
+        '<SOAP-ENV:Body>'
+        f'<OTA_HotelResNotifRQ xmlns="http://www.opentravel.org/OTA/2003/05" EchoToken={quoteattr(echo_token)} '
+        'TimeStamp="2026-01-01T00:00:00Z" Version="1.0" ResStatus="Commit">'
+        f'<HotelReservations>{"".join(hotel_reservations)}</HotelReservations>'
+        '</OTA_HotelResNotifRQ>'
+        '</SOAP-ENV:Body>'
+        '</SOAP-ENV:Envelope>'
+    ).encode("utf-8")
+
+
+def hotel_reservation(res_id, stays, given_name="Aung", surname="Min", amount="120.00"):
+    """One HotelReservation; ``stays`` is a list of ``(room_type, room_id, start, end, adults)``."""
+    room_stays = "".join(
+        f'<RoomStay><RoomTypes><RoomType RoomTypeCode="RT" RoomType={quoteattr(room_type)} '
+        f'RoomID={quoteattr(str(room_id))}/></RoomTypes>'
+        f'<GuestCounts><GuestCount AgeQualifyingCode="10" Count="{adults}"/></GuestCounts>'
+        f'<TimeSpan Start="{start.isoformat()}" End="{end.isoformat()}"/></RoomStay>'
+        for room_type, room_id, start, end, adults in stays
+    )
+    return (
+        f'<HotelReservation ResStatus="Book"><RoomStays>{room_stays}</RoomStays>'
+        f'<ResGlobalInfo><Total AmountAfterTax="{amount}" CurrencyCode="USD"/>'
+        f'<Profiles><ProfileInfo><Profile ProfileType="1"><Customer>'
+        f'<PersonName><GivenName>{escape(given_name)}</GivenName><Surname>{escape(surname)}</Surname></PersonName>'
+        f'<Telephone PhoneNumber="+95 9 555 0100"/><Email>{given_name.lower()}@example.com</Email>'
+        f'</Customer></Profile></ProfileInfo></Profiles>'
+        f'<HotelReservationIDs><HotelReservationID ResID_Type="14" ResID_Value={quoteattr(res_id)}/>'
+        f'</HotelReservationIDs></ResGlobalInfo></HotelReservation>'
+    )
+
+
+def generate_document(reservations=1, room_stays=1, room_types=1, guests=2, seed=0):
+    """A SOAP-wrapped OTA_HotelResNotifRQ, as bytes."""
+    rng = random.Random(seed)
+    return envelope(
+        [_hotel_reservation(rng, index, room_stays, room_types, guests) for index in range(reservations)],
+        echo_token=f"bench-{seed}",
+    )
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 
 from . import psn_api
+from . import reservation_api
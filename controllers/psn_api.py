@@ -1,11 +1,19 @@
+import hmac
+import logging
+
 from odoo import http
 from odoo.http import request
+from odoo.tools import str2bool
 from odoo.addons.psn_api.services.authentication_Service import AuthenticationService
 from odoo.addons.psn_api.services.xml_Parsing import XmlParsingService
-from odoo.addons.psn_api.services.cus_Data_Extractor import CustomerDataExtractor
-from odoo.addons.psn_api.services.room_stay_Extractor import RoomStayExtractor
-from odoo.addons.psn_api.services.mainService import ReservationService
+from odoo.addons.psn_api.services.ingestion_Pipeline import ReservationIngestionPipeline
 from odoo.addons.psn_api.services.responseBuilder import ResponseBuilder
+from odoo.addons.psn_api.services.soap_Parser import PARSER_ENGINE_PARAM
+from odoo.addons.psn_api.services.replay_Cache import ReplayCacheService
+from odoo.addons.psn_api.services.metrics_Registry import metrics, METRICS_TOKEN_PARAM
+from odoo.addons.psn_api.models.reservation_inbox import async_ingestion
+
+_logger = logging.getLogger(__name__)
 
 class PsnAPI(http.Controller):
 
@@ -13,133 +21,138 @@ class PsnAPI(http.Controller):
     def __init__(self):
         self.auth_service = AuthenticationService()
         self.xml_service = XmlParsingService()
-        self.customer_extractor = CustomerDataExtractor()
-        self.room_stay_extractor = RoomStayExtractor()
-        self.reservation_service = ReservationService()
+        self.ingestion_pipeline = ReservationIngestionPipeline()
         self.response_builder = ResponseBuilder()
+        self.replay_service = ReplayCacheService()
 
     @http.route(["/api/reservation"], methods=["POST"], type="http", auth="none", csrf=False)
     def handle_reservation(self, **post):
+        with metrics.stage("request"):
+            return self._handle_reservation()
+
+    def _handle_reservation(self):
         try:
-            soap_body = request.httprequest.data.decode("utf-8")
-            api_key = self.auth_service.extract_api_key_from_soap(soap_body)
+            soap_body = request.httprequest.data
+            with metrics.stage("parse"):
+                parser_engine = request.env["ir.config_parameter"].sudo().get_param(PARSER_ENGINE_PARAM, "etree")
+                parse_data = self.xml_service.parse_soap_message(soap_body, parser_engine)
+            if not parse_data:
+                return self._error_response(
+                    "Failed to parse XML. Make sure the SOAP body is well-formed.",
+                    "validation_error",
+                    None
+                )
+            api_key = parse_data.get("api_key")
             if not api_key:
-                return self.response_builder.build_error_response(
+                return self._error_response(
                     "Missing <wsse:Password> field in SOAP XML.",
                     "authentication_error",
-                    soap_body
+                    parse_data
                 )
-            access_token = self.auth_service.get_token(api_key)
+            with metrics.stage("authenticate"):
+                access_token = self.auth_service.get_token(api_key)
             if not access_token:
-                return self.response_builder.build_error_response(
+                return self._error_response(
                     "Invalid API key.",
                     "authentication_error",
-                    soap_body
-                )
-            parse_data = self.xml_service.parse_hotel_reservation_xml(soap_body)
-            if not parse_data:
-                return self.response_builder.build_error_response(
-                    "Failed to parse XML. Make sure the SOAP body is well-formed.",
-                    "validation_error",
-                    soap_body
+                    parse_data
                 )
             try:
-                hotel_reservation = self.xml_service.extract_reservation_data(parse_data)
+                with metrics.stage("extract"):
+                    hotel_reservations = self.xml_service.extract_reservations_data(parse_data)
             except Exception as e:
-                return self.response_builder.build_error_response(
+                return self._error_response(
                     f"Failed to extract reservation data: {str(e)}",
                     "validation_error",
                     parse_data
                 )
-            customer_info = self.customer_extractor.extract_customer_info(hotel_reservation)
-            if not customer_info.get('name'):
-                return self.response_builder.build_error_response(
-                    "Missing customer name in data",
-                    "validation_error",
-                    parse_data
-                )
-            room_stay_info = self.room_stay_extractor.extract_room_stay_info(hotel_reservation)
-            if not room_stay_info:
-                return self.response_builder.build_error_response(
-                    "No room stay information found in reservation",
-                    "validation_error",
-                    parse_data
-                )
-            warnings = []
-            if not customer_info.get('email'):
-                warnings.append({
-                    'type': '10',
-                    'code': '321',
-                    'message': 'Guest email address is required'
-                })
-
-            if not customer_info.get('phone'):
-                warnings.append({
-                    'type': '10',
-                    'code': '322',
-                    'message': 'Guest phone number is recommended'
-                })
-            if not customer_info.get('amount_after_tax') or customer_info.get('amount_after_tax') == '0':
-                warnings.append({
-                    'type': '10',
-                    'code': '323',
-                    'message': 'Total amount information is missing'
-                })
-            if room_stay_info.get('adults', 0) <= 1 and room_stay_info.get('children', 0) == 0:
-                warnings.append({
-                    'type': '10',
-                    'code': '324',
-                    'message': 'Guest count information was defaulted'
-                })
-
-            room_stay_info['siteminder_id'] = customer_info.get('siteminder_id', '')
-
-            siteminder_id = customer_info.get('siteminder_id')
-
-
-            if siteminder_id:
-                existing_reservation = self.reservation_service.find_reservation_by_siteminder_id(siteminder_id)
-                if existing_reservation:
-
-                    reservation_result = self.reservation_service.update_hotel_reservation(
-                        siteminder_id, customer_info, room_stay_info
-                    )
-                    action = "updated"
-                else:
 
-                    reservation_result = self.reservation_service.create_hotel_reservation(
-                        customer_info, room_stay_info
+            res_id_values = self.replay_service.extract_res_id_values(hotel_reservations)
+            replay_key = self.replay_service.build_key(parse_data.get("echo_token"), res_id_values, soap_body)
+
+            if str2bool(request.env["ir.config_parameter"].sudo().get_param(async_ingestion, "False"), False):
+                with metrics.stage("enqueue"):
+                    request.env["api.reservation.inbox"].sudo().enqueue(
+                        replay_key, parse_data.get("echo_token"), res_id_values, soap_body.decode("utf-8")
                     )
-                    action = "created"
-            else:
-                return self.response_builder.build_error_response(
-                    "Missing siteminder_id in reservation data",
-                    "validation_error",
-                    parse_data
+                metrics.record_request("queued")
+                return self.response_builder.build_acknowledgement_response(
+                    parse_data, res_id_values.split(",")
                 )
 
-            if reservation_result['success']:
-                reservation_result['action'] = action
-                if warnings:
-                    return self.response_builder.build_success_with_warnings_response(
-                        reservation_result, parse_data, warnings
-                    )
-                else:
+            with metrics.stage("replay_lookup"):
+                replayed_response = self.replay_service.find_response(replay_key)
+            if replayed_response is not None:
+                metrics.record_request("replayed")
+                return replayed_response
 
-                    return self.response_builder.build_success_response(reservation_result, parse_data)
-            else:
-                error_type = reservation_result.get('error_type', 'unknown_error')
-                error_message = reservation_result.get('error', 'Unknown error occurred')
-                return self.response_builder.build_error_response(
-                    error_message,
-                    error_type,
-                    parse_data
-                )
+            with metrics.stage("ingest"):
+                results = self.ingestion_pipeline.process(hotel_reservations)
+            for result in results:
+                if not result['success']:
+                    self._record_error(result.get('error_type'))
+            metrics.record_request("success" if any(result['success'] for result in results) else "error")
 
-        except Exception as e:
+            with metrics.stage("build_response"):
+                response = self._build_reservation_response(results, parse_data)
+            if self.replay_service.is_replayable(results):
+                with metrics.stage("replay_store"):
+                    self.replay_service.store_response(
+                        replay_key, parse_data.get("echo_token"), res_id_values, response
+                    )
+            return response
 
-            return self.response_builder.build_error_response(
+        except Exception as e:
+            _logger.exception("Unexpected error while handling a SiteMinder reservation")
+            return self._error_response(
                 f"An unexpected error occurred: {str(e)}",
                 "system_error",
                 None
             )
+
+    @http.route(["/api/metrics"], methods=["GET"], type="http", auth="none", csrf=False)
+    def metrics_endpoint(self, **kw):
+        token = request.env["ir.config_parameter"].sudo().get_param(METRICS_TOKEN_PARAM)
+        if not token:
+            return request.not_found()
+        authorization = request.httprequest.headers.get("Authorization", "")
+        if not hmac.compare_digest(authorization, f"Bearer {token}"):
+            return request.make_response("Unauthorized", status=401)
+        return request.make_response(
+            metrics.render(),
+            headers=[("Content-Type", "text/plain; version=0.0.4; charset=utf-8")]
+        )
+
+    @staticmethod
+    def _record_error(error_type):
+        # The raw error type, not its OTA code: room conflicts, missing rooms
+        # and state errors all share a code but need telling apart here.
+        metrics.record_error(error_type or "unknown_error")
+
+    def _error_response(self, error_message, error_type, parse_data):
+        self._record_error(error_type)
+        metrics.record_request("error")
+        return self.response_builder.build_error_response(error_message, error_type, parse_data)
+
+    def _build_reservation_response(self, results, parse_data):
+        if len(results) > 1:
+            return self.response_builder.build_batch_response(results, parse_data)
+
+        reservation_result = results[0]
+        if reservation_result['success']:
+            warnings = reservation_result['warnings']
+            if warnings:
+                return self.response_builder.build_success_with_warnings_response(
+                    reservation_result, parse_data, warnings
+                )
+            else:
+
+                return self.response_builder.build_success_response(reservation_result, parse_data)
+        else:
+            error_type = reservation_result.get('error_type', 'unknown_error')
+            error_message = reservation_result.get('error', 'Unknown error occurred')
+            return self.response_builder.build_error_response(
+                error_message,
+                error_type,
+                parse_data
+            )
@@ -0,0 +1,160 @@
+import functools
+from datetime import date
+
+from odoo import http
+from odoo.exceptions import AccessError
+from odoo.http import request
+from odoo.addons.psn_api.models.common import (
+    decode_cursor,
+    encode_cursor,
+    extract_arguments,
+    invalid_response,
+    stream_response,
+    valid_response,
+)
+from odoo.addons.psn_api.services.authentication_Service import AuthenticationService
+from odoo.addons.psn_api.services.availability_Matrix import AvailabilityMatrixService
+from odoo.addons.psn_api.services.keyset_Query import KeysetQueryService
+
+RESERVATION_FIELDS = [
+    "reservation_no", "siteminder_id", "state", "customer_name", "checkin", "checkout",
+    "adults", "children", "payment", "write_date",
+]
+ROOM_LINE_FIELDS = ["reservation_id", "room_id", "check_in", "check_out", "state", "status", "write_date"]
+
+
+def validate_token(func):
+    """Authenticate the request with an api.access_token.
+
+    The token is read from the ``access_token`` header or an
+    ``Authorization: Bearer`` header; an ``api_key`` header is exchanged
+    for a token the same way the SOAP endpoint does.
+    """
+
+    @functools.wraps(func)
+    def wrap(self, *args, **kwargs):
+        headers = request.httprequest.headers
+        access_token = headers.get("access_token")
+        authorization = headers.get("Authorization", "")
+        if not access_token and authorization.startswith("Bearer "):
+            access_token = authorization[len("Bearer "):].strip()
+        if not access_token and headers.get("api_key"):
+            access_token = AuthenticationService.get_token(headers["api_key"])
+        if not access_token:
+            return invalid_response("access_token_not_found", "missing access token in request header", 401)
+
+        access_token_data = request.env["api.access_token"].sudo().search(
+            [("token", "=", access_token)], order="id DESC", limit=1
+        )
+        if not access_token_data or not access_token_data.is_valid():
+            return invalid_response("access_token", "token seems to have expired or invalid", 401)
+
+        request.uid = access_token_data.user_id.id
+        return func(self, *args, **kwargs)
+
+    return wrap
+
+
+class ReservationReadAPI(http.Controller):
+    """Read-only JSON listing of reservations and room lines for reporting.
+
+    Query parameters: ``domain`` (JSON or ``field:op:value,...``), ``fields``
+    (comma-separated projection), ``limit`` (at most 1000), ``order_by``
+    (``id`` or ``write_date``) and ``cursor``, the ``next_cursor`` of the
+    previous page.
+
+    The ``/export`` variants stream every matching row in one response
+    instead of a page; ``with_count=1`` adds an ``X-Total-Count`` header.
+    """
+
+    @http.route(["/api/reservations"], methods=["GET"], type="http", auth="none", csrf=False)
+    @validate_token
+    def list_reservations(self, **params):
+        return self._list("hotel.reservation", RESERVATION_FIELDS, params)
+
+    @http.route(["/api/reservations/room_lines"], methods=["GET"], type="http", auth="none", csrf=False)
+    @validate_token
+    def list_room_lines(self, **params):
+        return self._list("hotel.room.reservation.line", ROOM_LINE_FIELDS, params)
+
+    @http.route(["/api/reservations/export"], methods=["GET"], type="http", auth="none", csrf=False)
+    @validate_token
+    def export_reservations(self, **params):
+        return self._list("hotel.reservation", RESERVATION_FIELDS, params, stream=True)
+
+    @http.route(["/api/reservations/room_lines/export"], methods=["GET"], type="http", auth="none", csrf=False)
+    @validate_token
+    def export_room_lines(self, **params):
+        return self._list("hotel.room.reservation.line", ROOM_LINE_FIELDS, params, stream=True)
+
+    @http.route(["/api/availability"], methods=["GET"], type="http", auth="none", csrf=False)
+    @validate_token
+    def availability_matrix(self, **params):
+        """Room × night availability for the nights from ``start`` up to, not including, ``end``.
+
+        ``room_type_ids`` (comma-separated) narrows the rooms. ``data`` holds
+        one row per room with a ``free`` flag per night; ``room_types`` holds
+        the number of free rooms of each type per night.
+        """
+        try:
+            first_night = date.fromisoformat(params.get("start", ""))
+            end = date.fromisoformat(params.get("end", ""))
+            room_type_ids = [int(value) for value in params.get("room_type_ids", "").split(",") if value.strip()]
+        except ValueError:
+            return invalid_response(
+                "invalid_arguments", "start and end must be YYYY-MM-DD dates and room_type_ids a list of ids", 400
+            )
+
+        try:
+            matrix = AvailabilityMatrixService.compute(first_night, (end - first_night).days, room_type_ids)
+        except AccessError as e:
+            return invalid_response("access_error", e, 403)
+        except ValueError as e:
+            return invalid_response("invalid_arguments", e, 400)
+
+        return valid_response(matrix["rooms"], nights=matrix["nights"], room_types=matrix["room_types"])
+
+    def _list(self, model_name, default_fields, params, stream=False):
+        model = request.env[model_name]
+        order_by = params.get("order_by", "id")
+        if order_by not in KeysetQueryService.ORDERS:
+            return invalid_response(
+                "invalid_order", f"order_by must be one of: {', '.join(KeysetQueryService.ORDERS)}", 400
+            )
+        try:
+            domain, fields, _offset, limit, _order = extract_arguments(
+                limit=str(KeysetQueryService.MAX_LIMIT) if stream else params.get("limit", "80"), domain=params.get("domain", ""), fields=params.get("fields", "")
+            )
+            after = None
+            if params.get("cursor"):
+                after = decode_cursor(params["cursor"], KeysetQueryService.ORDERS[order_by])
+        except ValueError as e:
+            return invalid_response("invalid_arguments", e, 400)
+
+        fields = fields or [name for name in default_fields if name in model._fields]
+        unknown_fields = [name for name in fields if name not in model._fields]
+        if unknown_fields:
+            return invalid_response("invalid_fields", f"Unknown fields: {', '.join(unknown_fields)}", 400)
+
+        try:
+            # The first page is read here so a bad domain or missing access
+            # is still reported as an error rather than a truncated stream.
+            rows, last_key = KeysetQueryService.fetch(model, domain, fields, limit, order_by, after)
+            count = model.search_count(domain) if stream and params.get("with_count") == "1" else None
+        except AccessError as e:
+            return invalid_response("access_error", e, 403)
+        except ValueError as e:
+            return invalid_response("invalid_domain", e, 400)
+
+        if stream:
+            return stream_response(self._export_rows(model, domain, fields, order_by, rows, last_key), count=count)
+        return valid_response(rows, next_cursor=encode_cursor(last_key) if last_key else None)
+
+    @staticmethod
+    def _export_rows(model, domain, fields, order_by, rows, last_key):
+        yield from rows
+        if last_key:
+            yield from KeysetQueryService.iterate(
+                model.env.registry, model.env.uid, dict(model.env.context), model._name,
+                domain, fields, order_by, last_key,
+            )
@@ -0,0 +1,8 @@
+from odoo import SUPERUSER_ID, api
+
+from .services.reservation_No import ReservationNumberGenerator
+
+
+def post_init_hook(cr, registry):
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    ReservationNumberGenerator.seed_reservation_sequence(env)
@@ -0,0 +1,9 @@
+from odoo import SUPERUSER_ID, api
+from odoo.addons.psn_api.services.reservation_No import ReservationNumberGenerator
+
+
+def migrate(cr, version):
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    ReservationNumberGenerator.seed_reservation_sequence(env)
@@ -1,4 +1,12 @@
 # -*- coding: utf-8 -*-
 
 from . import access_token
-from . import common
\ No newline at end of file
+from . import common
+from . import availability_change
+from . import hotel_room
+from . import room_reservation_line
+from . import room_occupancy
+from . import ir_config_parameter
+from . import reservation_replay
+from . import reservation_inbox
+from . import hotel_reservation
@@ -1,9 +1,10 @@
 import hashlib
 import logging
 import os
+import uuid
 from datetime import datetime, timedelta
 
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
 from odoo.tools import DEFAULT_SERVER_DATETIME_FORMAT
 
 _logger = logging.getLogger(__name__)
@@ -50,6 +51,18 @@ class APIAccessToken(models.Model):
             return None
         return access_token.token
 
+    @tools.ormcache()
+    def _api_key_cache_generation(self):
+        # Changes whenever the registry caches are cleared, in every worker.
+        return uuid.uuid4().hex
+
+    def _invalidate_api_key_cache(self):
+        self.clear_caches()
+
+    def unlink(self):
+        self._invalidate_api_key_cache()
+        return super().unlink()
+
     def is_valid(self, scopes=None):
         """
         Checks if the access token is valid.
@@ -81,3 +94,20 @@ class Users(models.Model):
         return x + y
 
     token_ids = fields.One2many("api.access_token", "user_id", string="Access Tokens")
+
+    def write(self, vals):
+        if "active" in vals:
+            self.env["api.access_token"]._invalidate_api_key_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env["api.access_token"]._invalidate_api_key_cache()
+        return super().unlink()
+
+
+class APIKeys(models.Model):
+    _inherit = "res.users.apikeys"
+
+    def _remove(self):
+        self.env["api.access_token"]._invalidate_api_key_cache()
+        return super()._remove()
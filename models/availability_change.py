@@ -0,0 +1,89 @@
+from odoo import api, fields, models
+from odoo.addons.psn_api.services.availability_Engine import stay_nights
+from odoo.addons.psn_api.services.availability_Push import AvailabilityPushService, PUSH_URL_PARAM
+from odoo.addons.psn_api.services.service_Env import use_env
+
+
+class AvailabilityChange(models.Model):
+    """(room type, night) cells whose availability changed since the last push.
+
+    Writers only ever insert, so concurrent bookings of the same room type
+    never wait on each other here; the push deduplicates the cells and
+    deletes exactly the rows it has sent. Nothing is recorded while no push
+    endpoint is configured.
+    """
+
+    _name = "api.availability.change"
+    _description = "Pending Availability Change"
+    _order = "id"
+    _log_access = False
+
+    room_type_id = fields.Many2one("hotel.room.type", string="Room Type", required=True, ondelete="cascade")
+    night = fields.Date(string="Night", required=True)
+
+    @api.model
+    def _tracking_enabled(self):
+        return bool(self.env["ir.config_parameter"].sudo().get_param(PUSH_URL_PARAM))
+
+    @api.model
+    def _mark_lines_where(self, condition, ids):
+        if not ids or not self._tracking_enabled():
+            return
+        with use_env(self.env):
+            config = AvailabilityPushService.config()
+        self.env["hotel.room.reservation.line"].flush(["room_id", "check_in", "check_out", "reservation_id"])
+        self.env["hotel.room"].flush(["room_categ_id"])
+        self.env.cr.execute(f"""
+            INSERT INTO api_availability_change (room_type_id, night)
+            SELECT DISTINCT room.room_categ_id, stay.night::date
+              FROM hotel_room_reservation_line line
+              JOIN hotel_room room ON room.id = line.room_id
+             CROSS JOIN LATERAL {stay_nights('line')} AS stay(night)
+             WHERE {condition} AND room.room_categ_id IS NOT NULL
+        """, {"ids": tuple(ids), "tz": config["tz"]})
+
+    @api.model
+    def _mark_room_lines(self, line_ids):
+        self._mark_lines_where("line.id IN %(ids)s", line_ids)
+
+    @api.model
+    def _mark_reservations(self, reservation_ids):
+        self._mark_lines_where("line.reservation_id IN %(ids)s", reservation_ids)
+
+    @api.model
+    def _mark_room_types(self, room_type_ids):
+        """Every night of the push horizon, for changes to the room inventory itself."""
+        if not room_type_ids or not self._tracking_enabled():
+            return
+        with use_env(self.env):
+            config = AvailabilityPushService.config()
+        self.env.cr.execute("""
+            INSERT INTO api_availability_change (room_type_id, night)
+            SELECT room_type.id, night::date
+              FROM unnest(%(ids)s::int[]) AS room_type(id)
+             CROSS JOIN generate_series(
+                   (now() AT TIME ZONE %(tz)s)::date,
+                   (now() AT TIME ZONE %(tz)s)::date + %(horizon)s - 1,
+                   interval '1 day'
+             ) AS night
+        """, {"ids": list(room_type_ids), "tz": config["tz"], "horizon": config["horizon"]})
+
+    @api.model
+    def _push_changes(self, limit=5000):
+        with use_env(self.env):
+            config = AvailabilityPushService.config()
+            if not config["url"]:
+                return
+            self.env.cr.execute(
+                "SELECT id, room_type_id, night FROM api_availability_change ORDER BY id LIMIT %s", (limit,)
+            )
+            ids_by_cell = {}
+            for change_id, room_type_id, night in self.env.cr.fetchall():
+                ids_by_cell.setdefault((room_type_id, night), []).append(change_id)
+
+            pushed = AvailabilityPushService.push(list(ids_by_cell), config)
+
+        # Cells changed again while pushing keep their newer rows for the next run.
+        sent_ids = [change_id for cell in pushed for change_id in ids_by_cell[cell]]
+        if sent_ids:
+            self.env.cr.execute("DELETE FROM api_availability_change WHERE id IN %s", (tuple(sent_ids),))
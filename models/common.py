@@ -1,11 +1,19 @@
 import ast
+import base64
 import datetime
 import json
 import logging
 import werkzeug.wrappers
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _logger = logging.getLogger(__name__)
 
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
 
 def default(o):
     if isinstance(o, (datetime.date, datetime.datetime)):
@@ -14,12 +22,48 @@ def default(o):
         return str(o)
 
 
-def valid_response(data, status=200):
+def json_dumps(data):
+    """Serialize ``data`` to JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        # Dates still go through ``default`` so both encoders produce the same values.
+        return orjson.dumps(data, default=default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=default).encode("utf-8")
+
+
+def valid_response(data, status=200, **meta):
     """Valid Response
-    This will be return when the http request was successfully processed."""
-    data = {"count": len(data) if not isinstance(data, str) else 1, "data": data}
+    This will be return when the http request was successfully processed.
+    Extra keyword arguments (e.g. ``next_cursor``) are added to the body."""
+    data = {"count": len(data) if not isinstance(data, str) else 1, "data": data, **meta}
+    return werkzeug.wrappers.Response(
+        status=status, content_type=JSON_CONTENT_TYPE, response=json_dumps(data),
+    )
+
+
+def stream_response(rows, status=200, count=None, chunk_size=256):
+    """Streamed Response
+    Same body as :func:`valid_response`, written in chunks while ``rows`` is
+    consumed, so memory does not grow with the number of rows. ``count``
+    comes after ``data`` in the body; when it is known up front it is also
+    sent as the ``X-Total-Count`` header."""
+
+    def generate():
+        total = 0
+        chunk = [b'{"data": [']
+        for row in rows:
+            if total:
+                chunk.append(b", ")
+            chunk.append(json_dumps(row))
+            total += 1
+            if len(chunk) >= chunk_size:
+                yield b"".join(chunk)
+                chunk = []
+        chunk.append(b'], "count": %d}' % total)
+        yield b"".join(chunk)
+
+    headers = [("X-Total-Count", str(count))] if count is not None else []
     return werkzeug.wrappers.Response(
-        status=status, content_type="application/json; charset=utf-8", response=json.dumps(data, default=default),
+        generate(), status=status, headers=headers, content_type=JSON_CONTENT_TYPE, direct_passthrough=True,
     )
 
 
@@ -42,7 +86,10 @@ def extract_arguments(limit="80", offset=0, order="id", domain="", fields=[]):
     """Parse additional data  sent along request."""
     limit = int(limit)
     expresions = []
-    if domain:
+    if domain and domain.lstrip().startswith("["):
+        # JSON domain, e.g. [["state", "=", "confirm"], ["checkin", ">=", "2024-01-01"]]
+        expresions = [tuple(leaf) if isinstance(leaf, list) else leaf for leaf in json.loads(domain)]
+    elif domain:
         expresions = [tuple(preg.replace(":", ",").split(",")) for preg in domain.split(",")]
         expresions = json.dumps(expresions)
         expresions = json.loads(expresions, parse_int=True)
@@ -52,3 +99,29 @@ def extract_arguments(limit="80", offset=0, order="id", domain="", fields=[]):
     if offset:
         offset = int(offset)
     return [expresions, fields, offset, limit, order]
+
+
+def encode_cursor(values):
+    """Opaque keyset pagination cursor for the sort key ``values`` of the last row."""
+    payload = json.dumps([v.isoformat() if isinstance(v, datetime.datetime) else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, order):
+    """Sort key values from :func:`encode_cursor`; ``order`` lists the key fields."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("invalid cursor")
+    if not isinstance(values, list) or len(values) != len(order):
+        raise ValueError("cursor does not match the requested order")
+    decoded = []
+    for field, value in zip(order, values):
+        if field == "id" and not isinstance(value, int):
+            raise ValueError("invalid cursor")
+        if field.endswith("date"):
+            if not isinstance(value, str):
+                raise ValueError("invalid cursor")
+            value = datetime.datetime.fromisoformat(value)
+        decoded.append(value)
+    return decoded
@@ -0,0 +1,57 @@
+import logging
+
+from odoo import fields, models
+from odoo.addons.psn_api.services.mainService import SITEMINDER_ID_UNIQUE_INDEX
+
+_logger = logging.getLogger(__name__)
+
+
+class HotelReservation(models.Model):
+    _inherit = "hotel.reservation"
+
+    siteminder_id = fields.Char(index=True, copy=False)
+
+    def write(self, vals):
+        res = super().write(vals)
+        # Only confirmed and done reservations hold their rooms.
+        if "state" in vals:
+            self.env["api.room.occupancy"]._refresh_reservations(self.ids)
+            self.env["api.availability.change"]._mark_reservations(self.ids)
+        return res
+
+    def unlink(self):
+        self.env["api.availability.change"]._mark_reservations(self.ids)
+        return super().unlink()
+
+    def init(self):
+        """Guarantee one reservation per SiteMinder booking.
+
+        A partial unique index is used so that reservations created by hand,
+        without a siteminder_id, are not affected.
+        """
+        cr = self.env.cr
+        # Keyset pagination of the reservation read API.
+        cr.execute("""
+            CREATE INDEX IF NOT EXISTS hotel_reservation_write_date_id_idx
+            ON hotel_reservation (write_date, id)
+        """)
+        cr.execute("""
+            SELECT siteminder_id
+              FROM hotel_reservation
+             WHERE siteminder_id IS NOT NULL AND siteminder_id != ''
+          GROUP BY siteminder_id
+            HAVING COUNT(*) > 1
+             LIMIT 10
+        """)
+        duplicates = [row[0] for row in cr.fetchall()]
+        if duplicates:
+            _logger.warning(
+                "Not enforcing unique siteminder_id on hotel.reservation, duplicates exist: %s",
+                ", ".join(duplicates),
+            )
+            return
+        cr.execute(f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS {SITEMINDER_ID_UNIQUE_INDEX}
+            ON hotel_reservation (siteminder_id)
+            WHERE siteminder_id IS NOT NULL AND siteminder_id != ''
+        """)
@@ -0,0 +1,15 @@
+from odoo import models
+
+
+class HotelRoom(models.Model):
+    _inherit = "hotel.room"
+
+    def write(self, vals):
+        # Moving or archiving a room changes how many rooms its type has.
+        if "room_categ_id" not in vals and "active" not in vals:
+            return super().write(vals)
+        room_type_ids = set(self.mapped("room_categ_id").ids)
+        res = super().write(vals)
+        room_type_ids.update(self.mapped("room_categ_id").ids)
+        self.env["api.availability.change"]._mark_room_types(room_type_ids)
+        return res
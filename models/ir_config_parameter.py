@@ -0,0 +1,32 @@
+from odoo import api, models
+from odoo.addons.psn_api.services.dataTime_Service import HOTEL_TIMEZONE_PARAM
+
+
+class IrConfigParameter(models.Model):
+    _inherit = "ir.config_parameter"
+
+    # The occupancy calendar stores hotel-local nights, so it is rebuilt
+    # whenever the hotel time zone is set, changed or removed.
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        if any(vals.get("key") == HOTEL_TIMEZONE_PARAM for vals in vals_list):
+            self.env["api.room.occupancy"].sudo()._rebuild()
+        return records
+
+    def write(self, vals):
+        touched = vals.get("key") == HOTEL_TIMEZONE_PARAM or any(
+            param.key == HOTEL_TIMEZONE_PARAM for param in self
+        )
+        res = super().write(vals)
+        if touched:
+            self.env["api.room.occupancy"].sudo()._rebuild()
+        return res
+
+    def unlink(self):
+        touched = any(param.key == HOTEL_TIMEZONE_PARAM for param in self)
+        res = super().unlink()
+        if touched:
+            self.env["api.room.occupancy"].sudo()._rebuild()
+        return res
@@ -0,0 +1,143 @@
+import json
+import logging
+from datetime import datetime, timedelta
+
+import psycopg2
+
+from odoo import api, fields, models
+from odoo.addons.psn_api.services.ingestion_Pipeline import ReservationIngestionPipeline
+from odoo.addons.psn_api.services.replay_Cache import ReplayCacheService
+from odoo.addons.psn_api.services.service_Env import use_env
+from odoo.addons.psn_api.services.soap_Parser import PARSER_ENGINE_PARAM
+from odoo.addons.psn_api.services.xml_Parsing import XmlParsingService
+
+_logger = logging.getLogger(__name__)
+
+async_ingestion = "psn_api.async_ingestion"
+inbox_max_attempts = "psn_api.inbox_max_attempts"
+
+
+class ReservationInbox(models.Model):
+    """Durable inbox of SiteMinder messages acknowledged before processing.
+
+    Workers claim messages with ``FOR UPDATE SKIP LOCKED`` and process each
+    one in its own transaction, so a crash leaves the message pending
+    (at-least-once). A message is only claimed once every earlier message
+    sharing one of its siteminder ids is finished, which keeps the
+    per-booking order of modifications.
+    """
+
+    _name = "api.reservation.inbox"
+    _description = "SiteMinder Reservation Inbox"
+    _order = "id"
+
+    key = fields.Char(string="Message Key", required=True, index=True)
+    echo_token = fields.Char(string="Echo Token")
+    siteminder_ids = fields.Char(string="Siteminder IDs", index=True)
+    body = fields.Text(string="SOAP Body", required=True)
+    state = fields.Selection(
+        [("pending", "Pending"), ("done", "Done"), ("failed", "Failed")],
+        string="Status", default="pending", required=True, index=True,
+    )
+    attempts = fields.Integer(string="Attempts", default=0)
+    next_attempt_date = fields.Datetime(string="Next Attempt")
+    processed_date = fields.Datetime(string="Processed On")
+    last_error = fields.Text(string="Last Error")
+    result = fields.Text(string="Result")
+
+    _sql_constraints = [
+        ("key_unique", "unique(key)", "This message is already in the inbox."),
+    ]
+
+    @api.model
+    def enqueue(self, key, echo_token, siteminder_ids, body):
+        """Persist a message once; redeliveries of the same message are ignored."""
+        vals = {
+            "key": key,
+            "echo_token": echo_token,
+            "siteminder_ids": siteminder_ids,
+            "body": body,
+        }
+        try:
+            with self.env.cr.savepoint():
+                return self.sudo().create(vals)
+        except psycopg2.IntegrityError:
+            return self.sudo().search([("key", "=", key)], limit=1)
+
+    @api.model
+    def _claim_next_message(self):
+        self.flush()
+        self.env.cr.execute("""
+            SELECT message.id
+              FROM api_reservation_inbox message
+             WHERE message.state = 'pending'
+               AND (message.next_attempt_date IS NULL OR message.next_attempt_date <= (now() at time zone 'UTC'))
+               AND NOT EXISTS (
+                   SELECT 1
+                     FROM api_reservation_inbox earlier
+                    WHERE earlier.id < message.id
+                      AND earlier.state = 'pending'
+                      AND string_to_array(earlier.siteminder_ids, ',') && string_to_array(message.siteminder_ids, ',')
+               )
+          ORDER BY message.id
+             LIMIT 1
+               FOR UPDATE SKIP LOCKED
+        """)
+        row = self.env.cr.fetchone()
+        return self.browse(row[0]) if row else self.browse()
+
+    @api.model
+    def _process_inbox(self, limit=50):
+        for _index in range(limit):
+            message = self._claim_next_message()
+            if not message:
+                break
+            message._process_message()
+            self.env.cr.commit()
+
+    def _process_message(self):
+        self.ensure_one()
+        engine = self.env["ir.config_parameter"].sudo().get_param(PARSER_ENGINE_PARAM, "etree")
+        try:
+            with self.env.cr.savepoint(), use_env(self.env):
+                parse_data = XmlParsingService.parse_soap_message(self.body, engine)
+                if not parse_data:
+                    raise ValueError("Failed to parse XML. Make sure the SOAP body is well-formed.")
+                hotel_reservations = XmlParsingService.extract_reservations_data(parse_data)
+                results = ReservationIngestionPipeline().process(hotel_reservations)
+        except Exception as e:
+            _logger.exception("Failed to process reservation inbox message %s", self.id)
+            self._schedule_retry(str(e))
+            return
+
+        # The message is already acknowledged: a transient failure (lock
+        # timeout, unexpected error) must be retried, not recorded as done.
+        transient = [
+            result for result in results
+            if result.get("error_type") in ReplayCacheService.TRANSIENT_ERROR_TYPES
+        ]
+        if transient:
+            _logger.warning("Reservation inbox message %s hit transient errors, retrying", self.id)
+            self._schedule_retry("; ".join(str(result.get("error")) for result in transient), results)
+            return
+
+        self.write({
+            "attempts": self.attempts + 1,
+            "state": "done",
+            "processed_date": fields.Datetime.now(),
+            "last_error": False,
+            "result": json.dumps(results, default=str),
+        })
+
+    def _schedule_retry(self, error, results=None):
+        max_attempts = int(self.env["ir.config_parameter"].sudo().get_param(inbox_max_attempts, 5))
+        attempts = self.attempts + 1
+        vals = {
+            "attempts": attempts,
+            "last_error": error,
+            "state": "failed" if attempts >= max_attempts else "pending",
+            "next_attempt_date": datetime.now() + timedelta(minutes=2 ** attempts),
+        }
+        if results is not None:
+            vals["result"] = json.dumps(results, default=str)
+        self.write(vals)
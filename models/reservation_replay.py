@@ -0,0 +1,56 @@
+import logging
+from datetime import datetime, timedelta
+
+import psycopg2
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+replay_retention_hours = "psn_api.replay_retention_hours"
+
+
+class ReservationReplay(models.Model):
+    _name = "api.reservation.replay"
+    _description = "SiteMinder Reservation Replay"
+    _order = "id DESC"
+
+    key = fields.Char(string="Replay Key", required=True, index=True)
+    echo_token = fields.Char(string="Echo Token")
+    res_id_values = fields.Char(string="ResID Values")
+    response_body = fields.Text(string="Response Body", required=True)
+
+    _sql_constraints = [
+        ("key_unique", "unique(key)", "A response is already stored for this message."),
+    ]
+
+    @api.model
+    def _retention_cutoff(self):
+        hours = int(self.env["ir.config_parameter"].sudo().get_param(replay_retention_hours, 24))
+        return datetime.now() - timedelta(hours=hours)
+
+    @api.model
+    def find_response(self, key):
+        replay = self.sudo().search([("key", "=", key), ("create_date", ">=", self._retention_cutoff())], limit=1)
+        return replay.response_body if replay else None
+
+    @api.model
+    def store_response(self, key, echo_token, res_id_values, response_body):
+        vals = {
+            "key": key,
+            "echo_token": echo_token,
+            "res_id_values": res_id_values,
+            "response_body": response_body,
+        }
+        try:
+            with self.env.cr.savepoint():
+                self.sudo().create(vals)
+        except psycopg2.IntegrityError:
+            # A concurrent delivery of the same message stored its response first.
+            pass
+
+    @api.model
+    def _gc_replay_entries(self):
+        expired = self.sudo().search([("create_date", "<", self._retention_cutoff())])
+        _logger.info("Removing %s expired reservation replay entries", len(expired))
+        expired.unlink()
@@ -0,0 +1,74 @@
+from odoo import api, fields, models
+from odoo.addons.psn_api.services.availability_Engine import AvailabilityEngine, stay_nights
+from odoo.addons.psn_api.services.dataTime_Service import HOTEL_TIMEZONE_PARAM
+
+
+class RoomOccupancy(models.Model):
+    """One row per room and night held by a confirmed or done reservation.
+
+    Rows are rewritten with SQL whenever a room line is created or moved
+    and whenever its reservation changes state; unlinked lines and
+    reservations drop theirs through the foreign keys. Nights are in the
+    hotel time zone; changing ``psn_api.hotel_timezone`` rebuilds the table.
+    """
+
+    _name = "api.room.occupancy"
+    _description = "Room Occupancy Calendar"
+    _order = "room_id, night"
+    _log_access = False
+
+    room_id = fields.Many2one("hotel.room", string="Room", required=True, ondelete="cascade")
+    night = fields.Date(string="Night", required=True)
+    line_id = fields.Many2one(
+        "hotel.room.reservation.line", string="Room Line", required=True, ondelete="cascade", index=True
+    )
+    reservation_id = fields.Many2one("hotel.reservation", string="Reservation", ondelete="cascade", index=True)
+
+    _sql_constraints = [
+        ("room_night_line_unique", "unique(room_id, night, line_id)", "A line holds a room night once."),
+    ]
+
+    def init(self):
+        self.env.cr.execute("SELECT 1 FROM api_room_occupancy LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._refresh_where("TRUE", None)
+
+    @api.model
+    def _refresh_where(self, condition, ids):
+        self.env["hotel.room.reservation.line"].flush(["room_id", "check_in", "check_out", "reservation_id"])
+        self.env["hotel.reservation"].flush(["state"])
+        params = {
+            "ids": ids,
+            "states": AvailabilityEngine.BLOCKING_STATES,
+            "tz": self.env["ir.config_parameter"].sudo().get_param(HOTEL_TIMEZONE_PARAM) or "UTC",
+        }
+        self.env.cr.execute(f"""
+            DELETE FROM api_room_occupancy occupancy
+             USING hotel_room_reservation_line line
+             WHERE line.id = occupancy.line_id AND {condition}
+        """, params)
+        self.env.cr.execute(f"""
+            INSERT INTO api_room_occupancy (room_id, night, line_id, reservation_id)
+            SELECT DISTINCT line.room_id, stay.night::date, line.id, line.reservation_id
+              FROM hotel_room_reservation_line line
+              JOIN hotel_reservation reservation ON reservation.id = line.reservation_id
+             CROSS JOIN LATERAL {stay_nights('line')} AS stay(night)
+             WHERE {condition}
+               AND line.room_id IS NOT NULL
+               AND reservation.state IN %(states)s
+        """, params)
+        self.invalidate_cache()
+
+    @api.model
+    def _refresh_room_lines(self, line_ids):
+        if line_ids:
+            self._refresh_where("line.id IN %(ids)s", tuple(line_ids))
+
+    @api.model
+    def _refresh_reservations(self, reservation_ids):
+        if reservation_ids:
+            self._refresh_where("line.reservation_id IN %(ids)s", tuple(reservation_ids))
+
+    @api.model
+    def _rebuild(self):
+        self._refresh_where("TRUE", None)
@@ -0,0 +1,41 @@
+from odoo import api, models
+
+# Writes to these fields move a line to other (room type, night) cells.
+AVAILABILITY_FIELDS = {"room_id", "check_in", "check_out", "reservation_id"}
+
+
+class HotelRoomReservationLine(models.Model):
+    _inherit = "hotel.room.reservation.line"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        self.env["api.room.occupancy"]._refresh_room_lines(lines.ids)
+        self.env["api.availability.change"]._mark_room_lines(lines.ids)
+        return lines
+
+    def write(self, vals):
+        tracked = AVAILABILITY_FIELDS.intersection(vals)
+        if tracked:
+            self.env["api.availability.change"]._mark_room_lines(self.ids)
+        res = super().write(vals)
+        if tracked:
+            self.env["api.room.occupancy"]._refresh_room_lines(self.ids)
+            self.env["api.availability.change"]._mark_room_lines(self.ids)
+        return res
+
+    def unlink(self):
+        self.env["api.availability.change"]._mark_room_lines(self.ids)
+        return super().unlink()
+
+    def init(self):
+        cr = self.env.cr
+        # Keyset pagination of the room line read API.
+        cr.execute("""
+            CREATE INDEX IF NOT EXISTS hotel_room_reservation_line_write_date_id_idx
+            ON hotel_room_reservation_line (write_date, id)
+        """)
+        # Conflicts are answered from api.room.occupancy; the stay_range
+        # column and its indexes only slowed down every line write.
+        cr.execute("DROP INDEX IF EXISTS hotel_room_reservation_line_room_id_idx")
+        cr.execute("ALTER TABLE hotel_room_reservation_line DROP COLUMN IF EXISTS stay_range")
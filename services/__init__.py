@@ -5,4 +5,17 @@ from . import  (authentication_Service,
                 dataTime_Service,
                 mainService,
                 reservation_No,
-                responseBuilder)
\ No newline at end of file
+                responseBuilder,
+                soap_Parser,
+                room_Resolver,
+                availability_Engine,
+                replay_Cache,
+                service_Env,
+                ingestion_Pipeline,
+                reservation_Diff,
+                metrics_Registry,
+                path_Extractor,
+                advisory_Lock,
+                keyset_Query,
+                availability_Push,
+                availability_Matrix)
@@ -0,0 +1,104 @@
+import hashlib
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2.errorcodes import LOCK_NOT_AVAILABLE
+
+from odoo import api, SUPERUSER_ID
+from .service_Env import get_env, use_env
+from .metrics_Registry import add_side_queries
+
+LOCK_TIMEOUT_PARAM = "psn_api.advisory_lock_timeout_ms"
+DEFAULT_LOCK_TIMEOUT_MS = 10000
+
+# First key of the two-key pg_advisory_xact_lock form ("PSN" + kind).
+BOOKING_LOCK_NAMESPACE = 0x50534E01
+ROOM_LOCK_NAMESPACE = 0x50534E02
+
+
+class AdvisoryLockService:
+    """Serialize concurrent messages touching the same booking or rooms.
+
+    Locks are transaction-level Postgres advisory locks, always taken in
+    ascending ``(namespace, key)`` order so two messages cannot deadlock.
+    They are meant to be taken at the start of a READ COMMITTED transaction
+    (see :func:`locked_transaction`): a waiter then reads what the previous
+    holder committed instead of failing with a serialization error.
+    """
+
+    @staticmethod
+    def booking_key(siteminder_id):
+
+        digest = hashlib.blake2b(siteminder_id.encode("utf-8"), digest_size=4).digest()
+        return int.from_bytes(digest, "big", signed=True)
+
+    @staticmethod
+    def lock_keys(siteminder_ids=(), room_ids=()):
+
+        keys = {(BOOKING_LOCK_NAMESPACE, AdvisoryLockService.booking_key(value)) for value in siteminder_ids if value}
+        keys.update((ROOM_LOCK_NAMESPACE, room_id) for room_id in room_ids if room_id)
+        return sorted(keys)
+
+    @staticmethod
+    def lock_timeout_ms():
+
+        value = get_env()["ir.config_parameter"].sudo().get_param(LOCK_TIMEOUT_PARAM)
+        try:
+            return int(value) if value else DEFAULT_LOCK_TIMEOUT_MS
+        except ValueError:
+            return DEFAULT_LOCK_TIMEOUT_MS
+
+    @staticmethod
+    def acquire(keys):
+        """Take every lock in ``keys``; False if one is still held after the lock timeout.
+
+        The timeout is the transaction's ``lock_timeout``, set for the whole
+        transaction by :func:`locked_transaction`.
+        """
+
+        if not keys:
+            return True
+        cr = get_env().cr
+        try:
+            # A timed-out wait rolls the savepoint back, releasing the locks taken so far.
+            with cr.savepoint(flush=False):
+                for namespace, key in keys:
+                    cr.execute("SELECT pg_advisory_xact_lock(%s, %s)", (namespace, key))
+        except psycopg2.OperationalError as e:
+            if e.pgcode == LOCK_NOT_AVAILABLE:
+                return False
+            raise
+        return True
+
+
+@contextmanager
+def locked_transaction():
+    """Bind a new READ COMMITTED transaction as the service environment.
+
+    It is committed when the block exits normally and rolled back on error.
+    The block works on its own cursor, so savepoints of the caller and the
+    request transaction do not cover it: once it has committed, nothing the
+    caller does afterwards can roll its writes back.
+
+    Every lock wait in it, advisory and row locks alike, is limited by
+    ``psn_api.advisory_lock_timeout_ms``. Lock timeouts come back as
+    ``concurrency_error`` results, which the replay cache and the inbox
+    treat as transient and retry. Its queries are added to the metrics of
+    the stages around it. Under test mode the current transaction is used
+    as is.
+    """
+
+    env = get_env()
+    if env.registry.in_test_mode():
+        yield env
+        return
+    timeout_ms = AdvisoryLockService.lock_timeout_ms()
+    with env.registry.cursor() as cr:
+        try:
+            cr.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+            cr.execute("SET LOCAL lock_timeout = %s", (f"{timeout_ms}ms",))
+            with use_env(api.Environment(cr, SUPERUSER_ID, dict(env.context))) as locked_env:
+                yield locked_env
+        finally:
+            # Stages opened on the request cursor ("store", "ingest") span this one.
+            add_side_queries(cr.sql_log_count)
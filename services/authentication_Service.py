@@ -1,5 +1,65 @@
-import xml.etree.ElementTree as ET
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
 from odoo.http import request
+from .metrics_Registry import metrics
+
+
+class ApiKeyCache:
+    """Per-worker LRU cache of authenticated API keys with a TTL.
+
+    An entry never outlives the access token it holds: ``set`` takes the
+    seconds left before the token expires and keeps the entry for the
+    shorter of that and the TTL.
+
+    Entries are keyed by a digest of the key, never the key itself, and are
+    tagged with the generation returned by
+    ``api.access_token._api_key_cache_generation``. Revoking a key or
+    deactivating a user clears the registry caches, which changes the
+    generation in every worker and makes older entries unusable.
+    """
+
+    def __init__(self, max_size=256, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(api_key):
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    def get(self, digest, generation):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            entry_generation, expires_at, value = entry
+            if entry_generation != generation or expires_at <= time.monotonic():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return value
+
+    def set(self, digest, generation, value, expires_in=None):
+        ttl = self.ttl if expires_in is None else min(self.ttl, expires_in)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = (generation, time.monotonic() + ttl, value)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+api_key_cache = ApiKeyCache()
 
 
 class AuthenticationService:
@@ -7,25 +67,20 @@ class AuthenticationService:
     @staticmethod
     def get_token(api_key):
         try:
-            user_id = request.env["res.users.apikeys"]._check_credentials(scope="rpc", key=api_key)
+            access_token_model = request.env["api.access_token"].sudo()
+            digest = api_key_cache.digest(api_key)
+            generation = access_token_model._api_key_cache_generation()
+            token = api_key_cache.get(digest, generation)
+            if token:
+                return token
+
+            with metrics.stage("api_key_check"):
+                user_id = request.env["res.users.apikeys"]._check_credentials(scope="rpc", key=api_key)
             if user_id:
-                access_token_model = request.env["api.access_token"]
                 token = access_token_model.find_or_create_token(user_id=user_id, create=True)
+                if token:
+                    expiry = access_token_model.search([("token", "=", token)], limit=1).token_expiry_date
+                    api_key_cache.set(digest, generation, token, (expiry - datetime.now()).total_seconds())
                 return token
         except Exception as e:
             return None
-
-    @staticmethod
-    def extract_api_key_from_soap(xml_data):
-        ns = {
-            "wsse": "http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd",
-            "soapenv": "http://schemas.xmlsoap.org/soap/envelope/"
-        }
-        try:
-            root = ET.fromstring(xml_data)
-            password_el = root.find(".//wsse:Password", ns)
-            if password_el is not None and password_el.text:
-                return password_el.text.strip()
-        except ET.ParseError as e:
-            return None
-
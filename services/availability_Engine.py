@@ -0,0 +1,111 @@
+from .service_Env import get_env
+from .dataTime_Service import DateTimeHelper
+
+
+def stay_nights(alias):
+    """SQL set of the local (hotel time zone, ``%(tz)s``) nights a stay occupies.
+
+    From the check-in date up to, not including, the check-out date; a
+    same-day stay occupies one night. ``alias`` is any row with UTC
+    ``check_in`` and ``check_out`` timestamps.
+    """
+    check_in = f"({alias}.check_in AT TIME ZONE 'UTC' AT TIME ZONE %(tz)s)::date"
+    check_out = f"({alias}.check_out AT TIME ZONE 'UTC' AT TIME ZONE %(tz)s)::date"
+    return f"generate_series({check_in}, GREATEST({check_out}, {check_in} + 1) - 1, interval '1 day')"
+
+
+class AvailabilityEngine:
+    """Answer "which of these rooms are taken on these nights" with index lookups.
+
+    Backed by ``api.room.occupancy``, one row per room and night held by a
+    confirmed or done reservation, so a check costs one lookup per
+    requested room night however many bookings the hotel has.
+    """
+
+    BLOCKING_STATES = ('confirm', 'done')
+
+    @staticmethod
+    def find_conflicts(room_stays, exclude_reservation_id=None):
+        """Return the booked lines sharing a night with each requested stay.
+
+        ``room_stays`` is a list of ``(room_id, check_in, check_out)``. The
+        result maps the index of each conflicting stay to a list of
+        ``(check_in, check_out, reservation_id)`` tuples.
+        """
+
+        if not room_stays:
+            return {}
+
+        env = get_env()
+        env['api.room.occupancy'].flush()
+
+        env.cr.execute(f"""
+            SELECT DISTINCT requested.idx, line.check_in, line.check_out, line.reservation_id
+              FROM unnest(%(room_ids)s::int[], %(check_ins)s::timestamp[], %(check_outs)s::timestamp[])
+                   WITH ORDINALITY AS requested(room_id, check_in, check_out, idx)
+             CROSS JOIN LATERAL {stay_nights('requested')} AS stay(night)
+              JOIN api_room_occupancy occupancy
+                ON occupancy.room_id = requested.room_id
+               AND occupancy.night = stay.night::date
+              JOIN hotel_room_reservation_line line
+                ON line.id = occupancy.line_id
+             WHERE occupancy.reservation_id IS DISTINCT FROM %(exclude)s
+          ORDER BY requested.idx, line.check_in
+        """, {
+            'room_ids': [room_id for room_id, check_in, check_out in room_stays],
+            'check_ins': [check_in for room_id, check_in, check_out in room_stays],
+            'check_outs': [check_out for room_id, check_in, check_out in room_stays],
+            'exclude': exclude_reservation_id,
+            'tz': DateTimeHelper.hotel_timezone(),
+        })
+
+        conflicts = {}
+        for idx, check_in, check_out, reservation_id in env.cr.fetchall():
+            conflicts.setdefault(idx - 1, []).append((check_in, check_out, reservation_id))
+        return conflicts
+
+    @staticmethod
+    def booked_room_nights(probes):
+        """The ``(room_id, night)`` pairs of ``probes`` that are taken, as a set."""
+
+        if not probes:
+            return set()
+
+        env = get_env()
+        env['api.room.occupancy'].flush()
+        env.cr.execute("""
+            SELECT probe.room_id, probe.night
+              FROM unnest(%s::int[], %s::date[]) AS probe(room_id, night)
+             WHERE EXISTS (
+                   SELECT 1
+                     FROM api_room_occupancy occupancy
+                    WHERE occupancy.room_id = probe.room_id
+                      AND occupancy.night = probe.night
+             )
+        """, ([room_id for room_id, night in probes], [night for room_id, night in probes]))
+        return set(env.cr.fetchall())
+
+    @staticmethod
+    def booked_night_offsets(room_ids, first_night, nights):
+        """Taken nights in ``[first_night, first_night + nights)`` as two parallel lists.
+
+        Returns ``(room_ids, offsets)``, ``offsets`` counting nights from
+        ``first_night``; flat arrays load into NumPy far faster than rows.
+        """
+
+        if not room_ids or nights <= 0:
+            return [], []
+
+        env = get_env()
+        env['api.room.occupancy'].flush()
+        env.cr.execute("""
+            SELECT coalesce(array_agg(taken.room_id), '{}'), coalesce(array_agg(taken.night_offset), '{}')
+              FROM (
+                  SELECT DISTINCT room_id, night - %(first_night)s::date AS night_offset
+                    FROM api_room_occupancy
+                   WHERE room_id = ANY(%(room_ids)s)
+                     AND night >= %(first_night)s::date
+                     AND night < %(first_night)s::date + %(nights)s
+              ) taken
+        """, {'room_ids': list(room_ids), 'first_night': first_night, 'nights': nights})
+        return env.cr.fetchone()
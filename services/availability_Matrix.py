@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+from .service_Env import get_env
+from .availability_Engine import AvailabilityEngine
+from .metrics_Registry import metrics
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class AvailabilityMatrixService:
+    """Which rooms are free on each night of a window, and how many per room type.
+
+    Taken nights come from the occupancy calendar in one query and are
+    scattered into a room × night boolean array; per-type counts are
+    column sums over each type's block of rows. NumPy does both when it
+    is installed, plain lists otherwise.
+    """
+
+    MAX_NIGHTS = 366
+
+    @staticmethod
+    def compute(first_night, nights, room_type_ids=None):
+        """Return ``{'nights', 'rooms', 'room_types'}`` for ``nights`` nights from ``first_night``.
+
+        Each room carries a ``free`` list of booleans and each room type a
+        ``free`` list of counts, one entry per night.
+        """
+
+        if not 0 < nights <= AvailabilityMatrixService.MAX_NIGHTS:
+            raise ValueError(f"The window must be between 1 and {AvailabilityMatrixService.MAX_NIGHTS} nights")
+
+        domain = [('room_categ_id', 'in', list(room_type_ids))] if room_type_ids else []
+        rooms = get_env()['hotel.room'].search_read(domain, ['name', 'room_categ_id'])
+        rooms.sort(key=lambda room: (
+            room['room_categ_id'] and room['room_categ_id'][1] or '',
+            room['room_categ_id'] and room['room_categ_id'][0] or 0,
+            room['name'] or '',
+            room['id'],
+        ))
+
+        starts = AvailabilityMatrixService._type_starts(rooms)
+        with metrics.stage("availability_matrix"):
+            booked = AvailabilityEngine.booked_night_offsets([room['id'] for room in rooms], first_night, nights)
+            if np is not None:
+                free_rows, type_counts = AvailabilityMatrixService._fill_numpy(rooms, starts, nights, booked)
+            else:
+                free_rows, type_counts = AvailabilityMatrixService._fill_lists(rooms, starts, nights, booked)
+
+        room_types = []
+        for start, end, counts in zip(starts, starts[1:] + [len(rooms)], type_counts):
+            room_type = rooms[start]['room_categ_id']
+            room_types.append({
+                'id': room_type and room_type[0],
+                'name': room_type and room_type[1],
+                'rooms': end - start,
+                'free': counts,
+            })
+
+        return {
+            'nights': [first_night + timedelta(days=offset) for offset in range(nights)],
+            'rooms': [
+                {
+                    'id': room['id'],
+                    'name': room['name'],
+                    'room_type_id': room['room_categ_id'] and room['room_categ_id'][0],
+                    'free': free,
+                }
+                for room, free in zip(rooms, free_rows)
+            ],
+            'room_types': room_types,
+        }
+
+    @staticmethod
+    def _type_starts(rooms):
+        # Rooms are sorted by type, so each type is a contiguous block of rows.
+        starts = []
+        previous = object()
+        for index, room in enumerate(rooms):
+            room_type = room['room_categ_id'] and room['room_categ_id'][0]
+            if room_type != previous:
+                starts.append(index)
+                previous = room_type
+        return starts
+
+    @staticmethod
+    def _fill_numpy(rooms, starts, nights, booked):
+
+        if not rooms:
+            return [], []
+        room_ids = np.fromiter((room['id'] for room in rooms), dtype=np.intp, count=len(rooms))
+        row_of = np.full(room_ids.max() + 1, -1, dtype=np.intp)
+        row_of[room_ids] = np.arange(len(rooms))
+
+        free = np.ones((len(rooms), nights), dtype=bool)
+        taken_rooms, taken_offsets = booked
+        if taken_rooms:
+            free[row_of[np.array(taken_rooms, dtype=np.intp)], np.array(taken_offsets, dtype=np.intp)] = False
+
+        counts = np.add.reduceat(free.astype(np.intp), starts, axis=0)
+        return free.tolist(), counts.tolist()
+
+    @staticmethod
+    def _fill_lists(rooms, starts, nights, booked):
+
+        row_of = {room['id']: index for index, room in enumerate(rooms)}
+        free = [[True] * nights for _room in rooms]
+        for room_id, offset in zip(*booked):
+            free[row_of[room_id]][offset] = False
+
+        counts = [
+            [sum(column) for column in zip(*free[start:end])]
+            for start, end in zip(starts, starts[1:] + [len(rooms)])
+        ]
+        return free, counts
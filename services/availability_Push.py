@@ -0,0 +1,219 @@
+import logging
+import threading
+import uuid
+from datetime import timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .service_Env import get_env
+from .availability_Engine import AvailabilityEngine
+from .dataTime_Service import HOTEL_TIMEZONE_PARAM
+from .metrics_Registry import metrics
+from .responseBuilder import _escape, _timestamp
+
+_logger = logging.getLogger(__name__)
+
+PUSH_URL_PARAM = "psn_api.availability_push_url"
+PUSH_HOTEL_CODE_PARAM = "psn_api.availability_push_hotel_code"
+PUSH_USERNAME_PARAM = "psn_api.availability_push_username"
+PUSH_PASSWORD_PARAM = "psn_api.availability_push_password"
+PUSH_BATCH_SIZE_PARAM = "psn_api.availability_push_batch_size"
+PUSH_TIMEOUT_PARAM = "psn_api.availability_push_timeout"
+PUSH_HORIZON_PARAM = "psn_api.availability_push_horizon_days"
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_TIMEOUT = 30
+DEFAULT_HORIZON_DAYS = 365
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _http_session():
+    """One keep-alive connection pool per worker, shared by every push."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            _session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            _session.headers["Content-Type"] = "text/xml; charset=utf-8"
+        return _session
+
+
+def _security(username, password):
+    if not username:
+        return ''
+    return f"""
+        <wsse:Security SOAP-ENV:mustUnderstand="1"
+             xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd">
+            <wsse:UsernameToken>
+                <wsse:Username>{username}</wsse:Username>
+                <wsse:Password Type="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-username-token-profile-1.0#PasswordText">{password}</wsse:Password>
+            </wsse:UsernameToken>
+        </wsse:Security>"""
+
+
+def _avail_notif(timestamp, echo_token, security, hotel_code, messages):
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">
+    <SOAP-ENV:Header>{security}
+    </SOAP-ENV:Header>
+    <SOAP-ENV:Body>
+        <OTA_HotelAvailNotifRQ xmlns="http://www.opentravel.org/OTA/2003/05"
+             Version="1.0" TimeStamp="{timestamp}" EchoToken="{echo_token}">
+            <AvailStatusMessages HotelCode="{hotel_code}">{messages}
+            </AvailStatusMessages>
+        </OTA_HotelAvailNotifRQ>
+    </SOAP-ENV:Body>
+</SOAP-ENV:Envelope>"""
+
+
+def _avail_status(inv_type_code, start, end, booking_limit):
+    return f"""
+                <AvailStatusMessage BookingLimit="{booking_limit}">
+                    <StatusApplicationControl Start="{start}" End="{end}" InvTypeCode="{inv_type_code}"/>
+                </AvailStatusMessage>"""
+
+
+class AvailabilityPushService:
+    """Push the availability of changed (room type, night) cells to the channel.
+
+    Cells are recorded by ``api.availability.change`` as room lines and
+    reservations change. Each push counts the free rooms of those cells
+    only, merges consecutive nights with the same count into one
+    ``AvailStatusMessage`` and posts ``OTA_HotelAvailNotifRQ`` batches to
+    the configured endpoint.
+    """
+
+    @staticmethod
+    def config():
+
+        get_param = get_env()['ir.config_parameter'].sudo().get_param
+
+        def to_int(value, fallback):
+            try:
+                return int(value) if value else fallback
+            except ValueError:
+                return fallback
+
+        return {
+            'url': get_param(PUSH_URL_PARAM),
+            'hotel_code': get_param(PUSH_HOTEL_CODE_PARAM) or '',
+            'username': get_param(PUSH_USERNAME_PARAM) or '',
+            'password': get_param(PUSH_PASSWORD_PARAM) or '',
+            'batch_size': max(1, to_int(get_param(PUSH_BATCH_SIZE_PARAM), DEFAULT_BATCH_SIZE)),
+            'timeout': to_int(get_param(PUSH_TIMEOUT_PARAM), DEFAULT_TIMEOUT),
+            'horizon': max(1, to_int(get_param(PUSH_HORIZON_PARAM), DEFAULT_HORIZON_DAYS)),
+            'tz': get_param(HOTEL_TIMEZONE_PARAM) or 'UTC',
+        }
+
+    @staticmethod
+    def count_available(cells):
+        """Free rooms of each ``(room_type_id, night)`` cell, as a dict."""
+
+        if not cells:
+            return {}
+
+        env = get_env()
+        rooms = env['hotel.room'].sudo().search([('room_categ_id', 'in', list({cell[0] for cell in cells}))])
+        rooms_by_type = {}
+        for room in rooms:
+            rooms_by_type.setdefault(room.room_categ_id.id, []).append(room.id)
+
+        probes = [
+            (room_id, night)
+            for room_type_id, night in cells
+            for room_id in rooms_by_type.get(room_type_id, [])
+        ]
+        room_types = {room.id: room.room_categ_id.id for room in rooms}
+        booked = {}
+        for room_id, night in AvailabilityEngine.booked_room_nights(probes):
+            cell = (room_types[room_id], night)
+            booked[cell] = booked.get(cell, 0) + 1
+
+        return {
+            cell: max(0, len(rooms_by_type.get(cell[0], [])) - booked.get(cell, 0))
+            for cell in cells
+        }
+
+    @staticmethod
+    def compact(availability):
+        """``(room_type_id, first_night, last_night, count)`` runs of consecutive nights with the same count."""
+
+        ranges = []
+        current = None
+        for (room_type_id, night), count in sorted(availability.items()):
+            if (current and current[0] == room_type_id and current[3] == count
+                    and (night - current[2]).days == 1):
+                current[2] = night
+                continue
+            if current:
+                ranges.append(tuple(current))
+            current = [room_type_id, night, night, count]
+        if current:
+            ranges.append(tuple(current))
+        return ranges
+
+    @staticmethod
+    def render(ranges, codes, config):
+
+        messages = ''.join(
+            _avail_status(_escape(codes[room_type_id]), start.isoformat(), end.isoformat(), count)
+            for room_type_id, start, end, count in ranges
+        )
+        return _avail_notif(
+            _timestamp(), str(uuid.uuid4()),
+            _security(_escape(config['username']), _escape(config['password'])),
+            _escape(config['hotel_code']), messages,
+        ).encode('utf-8')
+
+    @staticmethod
+    def send(body, config):
+
+        try:
+            with metrics.stage("availability_push"):
+                response = _http_session().post(config['url'], data=body, timeout=config['timeout'])
+        except requests.RequestException as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'error_type': 'connection_error'
+            }
+        if response.status_code >= 300 or b'<Errors' in response.content:
+            return {
+                'success': False,
+                'error': f"HTTP {response.status_code}: {response.text[:500]}",
+                'error_type': 'channel_error'
+            }
+        return {'success': True}
+
+    @staticmethod
+    def push(cells, config=None):
+        """Send the current availability of ``cells``; returns the cells that were accepted."""
+
+        config = config or AvailabilityPushService.config()
+        if not config['url'] or not cells:
+            return []
+
+        room_types = get_env()['hotel.room.type'].sudo().browse(list({cell[0] for cell in cells})).exists()
+        codes = {room_type.id: room_type.name for room_type in room_types}
+        # Cells of deleted room types have nothing left to push.
+        pushed = [cell for cell in cells if cell[0] not in codes]
+        availability = AvailabilityPushService.count_available([cell for cell in cells if cell[0] in codes])
+        ranges = AvailabilityPushService.compact(availability)
+
+        batch_size = config['batch_size']
+        for start in range(0, len(ranges), batch_size):
+            batch = ranges[start:start + batch_size]
+            result = AvailabilityPushService.send(AvailabilityPushService.render(batch, codes, config), config)
+            if not result['success']:
+                _logger.warning("Availability push failed: %s", result['error'])
+                metrics.record_push_error(result['error_type'])
+                break
+            for room_type_id, first_night, last_night, count in batch:
+                pushed.extend(
+                    (room_type_id, first_night + timedelta(days=offset))
+                    for offset in range((last_night - first_night).days + 1)
+                )
+        return pushed
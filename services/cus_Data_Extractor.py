@@ -1,71 +1,55 @@
 import re
 
-class CustomerDataExtractor:
+from .path_Extractor import Path, compile_path, compile_mapping
 
-    @staticmethod
-    def extract_customer_info(hotel_reservation):
-        res_global_info = hotel_reservation.get('ResGlobalInfo', {})
-        profiles_container = res_global_info.get("Profiles", {})
-        profile_infos = profiles_container.get("ProfileInfo", [])
+_NON_DIGITS = re.compile(r'\D')
 
+SITEMINDER_ID = Path('ResGlobalInfo/HotelReservationIDs/HotelReservationID/@ResID_Value', default='')
+extract_siteminder_id = compile_path(SITEMINDER_ID)
 
-        if isinstance(profile_infos, dict):
-            profile_infos = [profile_infos]
+# The profile of type 1 (the guest) if there is one, otherwise the first profile.
+_GUEST_CUSTOMER = compile_path("ResGlobalInfo/Profiles/ProfileInfo[Profile/@ProfileType='1']/Profile/Customer")
+_FIRST_CUSTOMER = compile_path("ResGlobalInfo/Profiles/ProfileInfo/Profile/Customer", default={})
 
-        first_profile_info = next(
-            (p for p in profile_infos if p.get('Profile', {}).get('@ProfileType') == '1'),
-            profile_infos[0] if profile_infos else {}
-        )
-        profile = first_profile_info.get("Profile", {})
-        customer = profile.get("Customer", {})
+_CUSTOMER_FIELDS = compile_mapping({
+    'first_name': Path('PersonName/GivenName/#text', default=''),
+    'last_name': Path('PersonName/Surname/#text', default=''),
+    'phone': Path('Telephone/@PhoneNumber', default=''),
+    'email': Path('Email/#text', default=''),
+})
 
-        person_name = customer.get('PersonName', {})
-        first_name = person_name.get("GivenName", '')
-        last_name = person_name.get("Surname", '')
-        customer_name = f'{first_name} {last_name}'.strip()
+_RESERVATION_FIELDS = compile_mapping({
+    'amount_after_tax': Path('ResGlobalInfo/Total/@AmountAfterTax', default='0'),
+    'siteminder_id': SITEMINDER_ID,
+    'deposit_percent': Path('ResGlobalInfo/DepositPayments/GuaranteePayment/AmountPercent/@Percent'),
+})
 
-        telephone = customer.get('Telephone', {})
-        phone_raw = telephone.get("@PhoneNumber", '') if isinstance(telephone, dict) else ''
-        phone = re.sub(r'\D', '', phone_raw)
 
-        email = customer.get('Email', '')
-        if isinstance(email, dict):
-            email = email.get("#text", '')
-
-        total_element = res_global_info.get('Total', {})
-        amount_after_tax = total_element.get('@AmountAfterTax', '0')
+class CustomerDataExtractor:
 
-        hotel_reservation_ids = res_global_info.get('HotelReservationIDs', {})
-        hotel_reservation_id = hotel_reservation_ids.get('HotelReservationID', {})
-        siteminder_id = hotel_reservation_id.get('@ResID_Value', '')
+    @staticmethod
+    def extract_customer_info(hotel_reservation):
+        customer = _GUEST_CUSTOMER(hotel_reservation) or _FIRST_CUSTOMER(hotel_reservation)
+        customer_fields = _CUSTOMER_FIELDS(customer)
+        reservation_fields = _RESERVATION_FIELDS(hotel_reservation)
 
+        customer_name = f"{customer_fields['first_name']} {customer_fields['last_name']}".strip()
 
         payment_status = "not_paid"
-
-        deposit_payments = res_global_info.get("DepositPayments", {})
-        guarantee_payments = deposit_payments.get("GuaranteePayment", [])
-
-        if isinstance(guarantee_payments, dict):
-            guarantee_payments = [guarantee_payments]
-
-        if guarantee_payments:
-            first_guarantee = guarantee_payments[0]
-            amount_percent = first_guarantee.get("AmountPercent", {})
-            percent_str = amount_percent.get("@Percent")
-            try:
-                percent = float(percent_str)
-                if percent == 100:
-                    payment_status = "paid"
-                elif percent > 0:
-                    payment_status = "partial_paid"
-            except (TypeError, ValueError):
-                pass
+        try:
+            percent = float(reservation_fields['deposit_percent'])
+            if percent == 100:
+                payment_status = "paid"
+            elif percent > 0:
+                payment_status = "partial_paid"
+        except (TypeError, ValueError):
+            pass
 
         return {
             'name': customer_name,
-            'email': email,
-            'phone': phone,
-            'amount_after_tax': amount_after_tax,
-            'siteminder_id': siteminder_id,
+            'email': customer_fields['email'],
+            'phone': _NON_DIGITS.sub('', customer_fields['phone']),
+            'amount_after_tax': reservation_fields['amount_after_tax'],
+            'siteminder_id': reservation_fields['siteminder_id'],
             'payment_status': payment_status
         }
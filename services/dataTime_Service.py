@@ -1,29 +1,105 @@
-from datetime import  datetime
+import logging
+from datetime import date, datetime, time
+from functools import lru_cache
+
+from .service_Env import get_env
+
+_logger = logging.getLogger(__name__)
+
+HOTEL_TIMEZONE_PARAM = "psn_api.hotel_timezone"
+
+START_OF_DAY = time(0, 0, 0)
+END_OF_DAY = time(23, 59, 59)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_fallback(date_string):
+    # Non-canonical dates such as 2024-1-5 or 2024/01/05.
+    parts = date_string.replace('/', '-').split('-')
+    if len(parts) == 3:
+        year, month, day = parts
+        date_string = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+    try:
+        return datetime.strptime(date_string, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=64)
+def _parse_time(time_string):
+    return datetime.strptime(time_string, '%H:%M:%S').time()
+
+
+@lru_cache(maxsize=64)
+def _timezone(tz_name):
+    import pytz
+    try:
+        return pytz.timezone(tz_name)
+    except pytz.UnknownTimeZoneError:
+        _logger.warning("Unknown hotel timezone %r, using UTC", tz_name)
+        return pytz.utc
+
 
 class DateTimeHelper:
+
+    @staticmethod
+    def parse_date(date_string):
+
+        if not date_string:
+            return None
+        date_string = date_string.strip()
+        if len(date_string) == 10 and date_string[4] == '-' and date_string[7] == '-':
+            try:
+                return date.fromisoformat(date_string)
+            except ValueError:
+                pass
+        return _parse_date_fallback(date_string)
+
     @staticmethod
     def parse_and_format_datetime(date_string, default_time):
+        """The date at ``default_time`` (a ``time`` or ``HH:MM:SS``), as a naive datetime."""
 
-        try:
-            if not date_string:
+        parsed_date = DateTimeHelper.parse_date(date_string)
+        if parsed_date is None:
+            return None
+        if not isinstance(default_time, time):
+            try:
+                default_time = _parse_time(default_time)
+            except ValueError:
                 return None
+        return datetime.combine(parsed_date, default_time)
+
+    @staticmethod
+    def hotel_timezone():
+
+        return get_env()['ir.config_parameter'].sudo().get_param(HOTEL_TIMEZONE_PARAM) or 'UTC'
+
+    @staticmethod
+    def hotel_time(tz_name):
+        """Current wall-clock time at the hotel, to the second."""
+
+        now = datetime.utcnow() if tz_name == 'UTC' else datetime.now(_timezone(tz_name))
+        return now.time().replace(microsecond=0)
+
+    @staticmethod
+    def to_utc(local_datetime, tz_name):
+        """Hotel-local naive datetime to the UTC naive datetime ``fields.Datetime`` stores."""
 
-            date_string = date_string.strip()
-            parts = date_string.replace('/', '-').split('-')
+        if local_datetime is None or tz_name == 'UTC':
+            return local_datetime
+        tz = _timezone(tz_name)
+        return tz.localize(local_datetime).astimezone(_timezone('UTC')).replace(tzinfo=None)
 
-            if len(parts) == 3:
-                year, month, day = parts
-                month = month.zfill(2)
-                day = day.zfill(2)
-                normalized_date = f"{year}-{month}-{day}"
-            else:
-                normalized_date = date_string
+    @staticmethod
+    def to_local(utc_datetime, tz_name):
+        """UTC naive datetime, as ``fields.Datetime`` stores it, to hotel-local naive."""
 
-            parsed_date = datetime.strptime(normalized_date, '%Y-%m-%d')
-            datetime_str = f"{normalized_date} {default_time}"
-            final_datetime = datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
+        if utc_datetime is None or tz_name == 'UTC':
+            return utc_datetime
+        return _timezone('UTC').localize(utc_datetime).astimezone(_timezone(tz_name)).replace(tzinfo=None)
 
-            return final_datetime
+    @staticmethod
+    def stay_datetime(date_string, local_time, tz_name):
+        """A stay date at the hotel's ``local_time``, as UTC naive, or None."""
 
-        except ValueError as e:
-            return None
\ No newline at end of file
+        return DateTimeHelper.to_utc(DateTimeHelper.parse_and_format_datetime(date_string, local_time), tz_name)
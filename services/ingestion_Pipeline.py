@@ -0,0 +1,98 @@
+from .cus_Data_Extractor import CustomerDataExtractor
+from .room_stay_Extractor import RoomStayExtractor
+from .mainService import ReservationService
+from .metrics_Registry import metrics
+
+
+class ReservationIngestionPipeline:
+    """Validate and store every HotelReservation of one message.
+
+    Shared by the synchronous controller and the asynchronous inbox workers.
+    """
+
+    def __init__(self):
+        self.customer_extractor = CustomerDataExtractor()
+        self.room_stay_extractor = RoomStayExtractor()
+        self.reservation_service = ReservationService()
+
+    def process(self, hotel_reservations):
+
+        with metrics.stage("prepare"):
+            prepared = [self.prepare_reservation(hotel_reservation) for hotel_reservation in hotel_reservations]
+        batch_items = [item for item in prepared if item['success']]
+        with metrics.stage("store"):
+            batch_results = iter(
+                self.reservation_service.process_reservation_batch(batch_items) if batch_items else []
+            )
+
+        results = []
+        for item in prepared:
+            if item['success']:
+                reservation_result = next(batch_results)
+                reservation_result['siteminder_id'] = item['customer_info'].get('siteminder_id')
+                reservation_result['warnings'] = item['warnings']
+                results.append(reservation_result)
+            else:
+                results.append(item)
+        return results
+
+    def prepare_reservation(self, hotel_reservation):
+        customer_info = self.customer_extractor.extract_customer_info(hotel_reservation)
+        if not customer_info.get('name'):
+            return {
+                'success': False,
+                'error': "Missing customer name in data",
+                'error_type': 'validation_error',
+                'siteminder_id': customer_info.get('siteminder_id'),
+            }
+        room_stay_info = self.room_stay_extractor.extract_room_stay_info(hotel_reservation)
+        if not room_stay_info:
+            return {
+                'success': False,
+                'error': "No room stay information found in reservation",
+                'error_type': 'validation_error',
+                'siteminder_id': customer_info.get('siteminder_id'),
+            }
+        warnings = []
+        if not customer_info.get('email'):
+            warnings.append({
+                'type': '10',
+                'code': '321',
+                'message': 'Guest email address is required'
+            })
+
+        if not customer_info.get('phone'):
+            warnings.append({
+                'type': '10',
+                'code': '322',
+                'message': 'Guest phone number is recommended'
+            })
+        if not customer_info.get('amount_after_tax') or customer_info.get('amount_after_tax') == '0':
+            warnings.append({
+                'type': '10',
+                'code': '323',
+                'message': 'Total amount information is missing'
+            })
+        if room_stay_info.get('adults', 0) <= 1 and room_stay_info.get('children', 0) == 0:
+            warnings.append({
+                'type': '10',
+                'code': '324',
+                'message': 'Guest count information was defaulted'
+            })
+
+        room_stay_info['siteminder_id'] = customer_info.get('siteminder_id', '')
+
+        if not customer_info.get('siteminder_id'):
+            return {
+                'success': False,
+                'error': "Missing siteminder_id in reservation data",
+                'error_type': 'validation_error',
+                'siteminder_id': '',
+            }
+
+        return {
+            'success': True,
+            'customer_info': customer_info,
+            'room_stay_info': room_stay_info,
+            'warnings': warnings,
+        }
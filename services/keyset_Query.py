@@ -0,0 +1,64 @@
+from odoo import api
+
+
+class KeysetQueryService:
+    """Page through a model in a stable order without OFFSET.
+
+    Each page continues strictly after the sort key of the previous page's
+    last row, so a page costs the same whether it is the first or the
+    thousandth. The domain and record rules are applied by the ORM; only the
+    keyset condition is added to its query.
+    """
+
+    ORDERS = {
+        'id': ('id',),
+        'write_date': ('write_date', 'id'),
+    }
+    MAX_LIMIT = 1000
+
+    @staticmethod
+    def fetch(model, domain, fields, limit, order_by='id', after=None):
+        """Return ``(rows, last_key)``; ``last_key`` is None on the last page."""
+
+        keys = KeysetQueryService.ORDERS[order_by]
+        limit = max(1, min(limit, KeysetQueryService.MAX_LIMIT))
+        table = model._table
+
+        query = model._search(domain, limit=limit + 1, order=", ".join(keys))
+        if isinstance(query, list):
+            # The ORM short-circuits domains that cannot match anything.
+            return [], None
+        columns = [f'"{table}"."{key}"' for key in keys]
+        if after is not None:
+            query.add_where(
+                f"({', '.join(columns)}) > ({', '.join(['%s'] * len(keys))})", list(after)
+            )
+        query_str, params = query.select(*columns)
+        model.env.cr.execute(query_str, params)
+        key_rows = model.env.cr.fetchall()
+
+        has_more = len(key_rows) > limit
+        key_rows = key_rows[:limit]
+        # ``id`` is always the last sort key.
+        rows = model.browse([key_row[-1] for key_row in key_rows]).read(fields)
+        return rows, (list(key_rows[-1]) if has_more else None)
+
+    @staticmethod
+    def iterate(registry, uid, context, model_name, domain, fields, order_by='id', after=None):
+        """Yield every row after ``after``, one page at a time, in a cursor of its own.
+
+        Used by streamed responses, which are written after the request's
+        cursor is closed. The record cache is dropped after each page so
+        memory stays flat however many rows are read.
+        """
+
+        with registry.cursor() as cr:
+            model = api.Environment(cr, uid, context)[model_name]
+            while True:
+                rows, after = KeysetQueryService.fetch(
+                    model, domain, fields, KeysetQueryService.MAX_LIMIT, order_by, after
+                )
+                yield from rows
+                if after is None:
+                    return
+                model.invalidate_cache()
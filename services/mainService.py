@@ -1,13 +1,28 @@
-from odoo.http import request
-from .dataTime_Service import  DateTimeHelper
+from .service_Env import get_env
+from .dataTime_Service import  DateTimeHelper, START_OF_DAY, END_OF_DAY
 from .reservation_No import  ReservationNumberGenerator
-from datetime import  datetime
+from .room_Resolver import RoomResolver
+from .availability_Engine import AvailabilityEngine
+from .reservation_Diff import ReservationDiffEngine
+from .metrics_Registry import metrics
+from .advisory_Lock import AdvisoryLockService, locked_transaction
 from odoo import  fields
 import logging
+from collections import Counter
 
+import psycopg2
+from psycopg2.errorcodes import LOCK_NOT_AVAILABLE, UNIQUE_VIOLATION
 
+SITEMINDER_ID_UNIQUE_INDEX = "hotel_reservation_siteminder_id_unique"
 
 
+class _BatchItemFailed(Exception):
+    """Raised inside a batch savepoint so a failed reservation rolls back alone."""
+
+    def __init__(self, result):
+        super().__init__(result.get('error'))
+        self.result = result
+
 
 class ReservationService:
 
@@ -16,94 +31,186 @@ class ReservationService:
         self.datetime_helper = DateTimeHelper()
         self.reservation_number_generator = ReservationNumberGenerator()
 
-    def find_reservation_by_siteminder_id(self, siteminder_id):
+    def prefetch_batch_lookup(self, items):
+        """Load everything a batch of reservations needs with one query per model."""
+
+        hotelReservation = get_env()['hotel.reservation'].sudo()
+
+        siteminder_ids = set()
+        room_types = []
+        for item in items:
+            if item['customer_info'].get('siteminder_id'):
+                siteminder_ids.add(item['customer_info']['siteminder_id'])
+            room_types.extend(item['room_stay_info'].get('room_types', []))
+
+        with metrics.stage("room_lookup"):
+            lookup = {'reservations': {}}
+            lookup.update(RoomResolver.resolve(room_types))
+            lookup['capacities'] = RoomResolver.capacities(lookup['rooms'].values())
+
+            if siteminder_ids:
+                for reservation in hotelReservation.search([('siteminder_id', 'in', list(siteminder_ids))]):
+                    lookup['reservations'].setdefault(reservation.siteminder_id, reservation)
+        return lookup
+
+    def process_reservation_batch(self, items):
+        """Create or update every reservation of one OTA_HotelResNotifRQ.
+
+        Each reservation runs in its own savepoint, so a failure rolls back
+        only that reservation and the rest of the batch is still committed.
+        The batch runs in its own transaction holding advisory locks on its
+        siteminder ids and rooms, so concurrent messages for the same booking
+        or rooms wait for each other instead of racing.
+        """
+
+        with locked_transaction():
+            siteminder_ids = [item['customer_info'].get('siteminder_id') for item in items]
+            with metrics.stage("lock_wait"):
+                locked = AdvisoryLockService.acquire(AdvisoryLockService.lock_keys(siteminder_ids=siteminder_ids))
+            if not locked:
+                return [self._lock_timeout_result() for _item in items]
+
+            lookup = self.prefetch_batch_lookup(items)
+            room_ids = {room.id for room in lookup['rooms'].values()}
+            for reservation in lookup['reservations'].values():
+                room_ids.update(reservation.reservation_line.mapped('reserve').ids)
+            with metrics.stage("lock_wait"):
+                locked = AdvisoryLockService.acquire(AdvisoryLockService.lock_keys(room_ids=room_ids))
+            if not locked:
+                return [self._lock_timeout_result() for _item in items]
+
+            results = []
+            for item in items:
+                try:
+                    with get_env().cr.savepoint():
+                        result = self._process_batch_item(item, lookup)
+                        if not result['success']:
+                            raise _BatchItemFailed(result)
+                except _BatchItemFailed as failure:
+                    result = failure.result
+                results.append(result)
+            return results
+
+    @staticmethod
+    def _lock_timeout_result():
+
+        return {
+            'success': False,
+            'error': "Timed out waiting for a concurrent message on the same reservation or rooms",
+            'error_type': 'concurrency_error'
+        }
+
+    def _process_batch_item(self, item, lookup):
+
+        customer_info = item['customer_info']
+        room_stay_info = item['room_stay_info']
+        siteminder_id = customer_info.get('siteminder_id')
+
+        if siteminder_id in lookup['reservations']:
+            result = self.update_hotel_reservation(siteminder_id, customer_info, room_stay_info, lookup=lookup)
+            result['action'] = 'updated'
+        else:
+            result = self.create_hotel_reservation(customer_info, room_stay_info, lookup=lookup)
+            result['action'] = 'created'
+
+        if result['success']:
+            lookup['reservations'][siteminder_id] = get_env()['hotel.reservation'].sudo().browse(
+                result['reservation_id']
+            )
+        return result
 
-        try:
-            hotelReservation = request.env['hotel.reservation']
-            reservation = hotelReservation.sudo().search([
-                ('siteminder_id', '=', siteminder_id)
-            ], limit=1)
-            return reservation if reservation else None
-        except Exception as e:
-            return None
+    def create_reservation_lines(self, room_types, room_price_summary=None, lookup=None):
 
-    def create_reservation_lines(self, room_types, room_price_summary=None):
+        resolved = lookup if lookup is not None else RoomResolver.resolve(room_types)
 
-        hotelRoomType = request.env['hotel.room.type']
-        hotelRoom = request.env['hotel.room']
+        missing = RoomResolver.missing_room_type_pairs(room_types, resolved)
+        if missing:
+            error_msg = "; ".join(
+                f"Could not find room type '{room_type_name}' or room '{room_type_code}' in Odoo"
+                for room_type_name, room_type_code in missing
+            )
+            raise ValueError(error_msg)
 
         reservation_lines = []
 
         for index, room_type_data in enumerate(room_types):
-            room_type_code = room_type_data.get('room_id', '')
-            room_type_name = room_type_data.get('room_type', '')
+            room_type_odoo = RoomResolver.get_room_type(resolved, room_type_data.get('room_type', ''))
+            room_odoo = RoomResolver.get_room(resolved, room_type_data.get('room_id', ''))
 
-            room_type_odoo = hotelRoomType.sudo().search([('name', '=', room_type_name)], limit=1)
-            room_odoo = hotelRoom.sudo().search([('name', '=', room_type_code)], limit=1)
-
-            if room_odoo and room_type_odoo:
-                line_vals = {
-                    'categ_id': room_type_odoo.id,
-                    'reserve': [(6, 0, [room_odoo.id])],
-                }
-                if index == 0 and room_price_summary:
-                    line_vals['promotion_price'] = float(room_price_summary)
+            line_vals = {
+                'categ_id': room_type_odoo.id,
+                'reserve': [(6, 0, [room_odoo.id])],
+            }
+            if index == 0 and room_price_summary:
+                line_vals['promotion_price'] = float(room_price_summary)
 
-                reservation_lines.append((0, 0, line_vals))
-
-            else:
-                error_msg = f"Could not find room type '{room_type_name}' or room '{room_type_code}' in Odoo"
-                raise ValueError(error_msg)
+            reservation_lines.append((0, 0, line_vals))
 
         return reservation_lines
 
-    def create_room_reservation_lines(self, reservation_id, checkin_date, checkout_date):
+    def create_room_reservation_lines(self, reservation_id, checkin_date, checkout_date, room_stays=None):
+        """Assign rooms to the reservation.
+
+        ``room_stays`` is a list of ``(room, check_in, check_out)``; when omitted
+        every reserved room is booked for ``[checkin_date, checkout_date)``.
+        """
 
         try:
-            hotelRoomReservationLine = request.env['hotel.room.reservation.line']
+            hotelRoomReservationLine = get_env()['hotel.room.reservation.line']
 
-            reservation = request.env['hotel.reservation'].sudo().browse(reservation_id)
+            reservation = get_env()['hotel.reservation'].sudo().browse(reservation_id)
 
             if not reservation:
                 raise ValueError(f"Reservation with ID {reservation_id} not found")
 
+            if room_stays is None:
+                room_stays = [
+                    (room, checkin_date, checkout_date)
+                    for line_id in reservation.reservation_line
+                    for room in line_id.reserve
+                ]
+
+            with metrics.stage("overlap_check"):
+                conflicts = AvailabilityEngine.find_conflicts(
+                    [(room.id, check_in, check_out) for room, check_in, check_out in room_stays],
+                    reservation.id
+                )
 
-            created_lines = []
-            for line_id in reservation.reservation_line:
-                for room in line_id.reserve:
-
-                    overlapping_reservations = hotelRoomReservationLine.sudo().search([
-                        ('room_id', '=', room.id),
-                        ('status', 'in', ('confirm', 'done')),
-                        '|',
-                        '&', ('check_in', '<=', checkin_date), ('check_out', '>', checkin_date),
-                        '&', ('check_in', '<', checkout_date), ('check_out', '>=', checkout_date),
-                    ])
-
-                    if overlapping_reservations:
-
-                        overlap_details = []
-                        for overlap in overlapping_reservations:
-                            overlap_details.append(f"Room {room.name} from {overlap.check_in} to {overlap.check_out}")
-
-                        raise ValueError(f"Room conflict detected: {'; '.join(overlap_details)}")
-
-                    vals = {
-                        'room_id': room.id,
-                        'check_in': checkin_date,
-                        'check_out': checkout_date,
-                        'state': 'assigned',
-                        'reservation_id': reservation.id,
-                    }
-
-                    room_line = hotelRoomReservationLine.sudo().create(vals)
-                    created_lines.append(room_line.id)
-
+            overlap_details = []
+            requested = {}
+            for index, (room, check_in, check_out) in enumerate(room_stays):
+                overlapping_reservations = [
+                    (overlap_in, overlap_out)
+                    for overlap_in, overlap_out, overlap_reservation_id in conflicts.get(index, [])
+                ]
+                overlapping_reservations += [
+                    (other_in, other_out)
+                    for other_in, other_out in requested.get(room.id, [])
+                    if other_in < check_out and other_out > check_in
+                ]
+                for overlap_in, overlap_out in overlapping_reservations:
+                    overlap_details.append(f"Room {room.name} from {overlap_in} to {overlap_out}")
+                requested.setdefault(room.id, []).append((check_in, check_out))
+
+            if overlap_details:
+                raise ValueError(f"Room conflict detected: {'; '.join(overlap_details)}")
+
+            room_lines = hotelRoomReservationLine.sudo().create([
+                {
+                    'room_id': room.id,
+                    'check_in': check_in,
+                    'check_out': check_out,
+                    'state': 'assigned',
+                    'reservation_id': reservation.id,
+                }
+                for room, check_in, check_out in room_stays
+            ])
+            created_lines = room_lines.ids
 
-                    room.sudo().write({
-                        'isroom': False,
-                        'status': 'occupied'
-                    })
+            rooms = get_env()['hotel.room'].sudo().browse(
+                sorted({room.id for room, check_in, check_out in room_stays})
+            )
+            self.set_rooms_status(rooms, 'occupied')
 
             reservation.sudo().write({'state': 'confirm'})
 
@@ -120,51 +227,92 @@ class ReservationService:
                 'error_type': 'room_line_creation_error'
             }
 
-    def validate_room_capacity(self, room_stay_info):
-        total_capacity = 0
-        hotelRoom = request.env['hotel.room']
+    @staticmethod
+    def set_rooms_status(rooms, status):
+        """Move every room to ``status`` with one grouped write."""
 
-        for room_type_data in room_stay_info['room_types']:
-            room_code = room_type_data.get('room_id', '')
-            room = hotelRoom.sudo().search([('name', '=', room_code)], limit=1)
+        if rooms:
+            rooms.sudo().write({
+                'isroom': status == 'available',
+                'status': status
+            })
 
-            if room:
-                capacity = getattr(room, 'capacity', 2)
-                total_capacity += capacity
+    def validate_room_capacity(self, room_stay_info, lookup=None):
+        """Return ``(is_valid, total_guests, total_capacity, details)``.
 
-            else:
-                error_msg = f"Room '{room_code}' not found for capacity validation"
-                raise ValueError(error_msg)
+        ``details`` names each room stay whose guests do not fit its rooms.
+        """
+        resolved = lookup if lookup is not None else RoomResolver.resolve(room_stay_info['room_types'])
+
+        missing = RoomResolver.missing_rooms(room_stay_info['room_types'], resolved)
+        if missing:
+            room_codes = ", ".join(f"'{room_code}'" for room_code in missing)
+            error_msg = f"Room {room_codes} not found for capacity validation"
+            raise ValueError(error_msg)
+
+        capacities = resolved.get('capacities')
+        if capacities is None:
+            capacities = RoomResolver.capacities(resolved['rooms'].values())
 
+        def room_capacity(room_type_data):
+            return capacities[RoomResolver.get_room(resolved, room_type_data.get('room_id', '')).id]
+
+        total_capacity = sum(room_capacity(room_type_data) for room_type_data in room_stay_info['room_types'])
         total_guests = room_stay_info['adults'] + room_stay_info['children']
-        return total_guests <= total_capacity, total_guests, total_capacity
 
-    def validate_room_availability_for_update(self, reservation_id, room_stay_info):
+        details = []
+        for stay in room_stay_info.get('room_stays', []):
+            if not stay['room_types']:
+                continue
+            stay_guests = stay['adults'] + stay['children']
+            stay_capacity = sum(room_capacity(room_type_data) for room_type_data in stay['room_types'])
+            if stay_guests > stay_capacity:
+                rooms = ", ".join(
+                    f"'{room_type_data.get('room_id', '')}' (capacity {room_capacity(room_type_data)})"
+                    for room_type_data in stay['room_types']
+                )
+                details.append(f"Room {rooms} cannot hold {stay_guests} guests")
+
+        return total_guests <= total_capacity, total_guests, total_capacity, details
+
+    @staticmethod
+    def capacity_error_message(total_guests, total_capacity, details):
+
+        message = f'Insufficient room capacity: {total_guests} guests require {total_capacity} total capacity'
+        return f"{message}: {'; '.join(details)}" if details else message
+
+    def validate_room_availability_for_update(self, reservation_id, room_stay_info, lookup=None):
 
         try:
-            hotelRoom = request.env['hotel.room']
-            checkin_date = self.datetime_helper.parse_and_format_datetime(
-                room_stay_info['checkin_date'], "00:00:00"
-            )
-            checkout_date = self.datetime_helper.parse_and_format_datetime(
-                room_stay_info['checkout_date'], "23:59:59"
-            )
+            resolved = lookup if lookup is not None else RoomResolver.resolve(room_stay_info['room_types'])
+
+            missing = RoomResolver.missing_rooms(room_stay_info['room_types'], resolved)
+            if missing:
+                room_codes = ", ".join(f"'{room_code}'" for room_code in missing)
+                return False, f"Room {room_codes} not found"
 
+            hotel_tz = self.datetime_helper.hotel_timezone()
+            requested = []
             for room_type_data in room_stay_info['room_types']:
                 room_code = room_type_data.get('room_id', '')
-                room = hotelRoom.sudo().search([('name', '=', room_code)], limit=1)
-
-                if not room:
-                    return False, f"Room '{room_code}' not found"
+                room = RoomResolver.get_room(resolved, room_code)
 
+                checkin_date = self.datetime_helper.stay_datetime(
+                    room_type_data.get('checkin_date') or room_stay_info['checkin_date'], START_OF_DAY, hotel_tz
+                )
+                checkout_date = self.datetime_helper.stay_datetime(
+                    room_type_data.get('checkout_date') or room_stay_info['checkout_date'], END_OF_DAY, hotel_tz
+                )
+                requested.append((room_code, room, checkin_date, checkout_date))
 
-                conflicting_reservations = room.room_reservation_line_ids.filtered(
-                    lambda l: l.status in ('confirm', 'done') and
-                              l.reservation_id.id != reservation_id and
-                              not (checkout_date <= l.check_in or checkin_date >= l.check_out)
+            with metrics.stage("overlap_check"):
+                conflicts = AvailabilityEngine.find_conflicts(
+                    [(room.id, checkin_date, checkout_date) for room_code, room, checkin_date, checkout_date in requested],
+                    reservation_id
                 )
 
-                if conflicting_reservations:
+            for index, (room_code, room, checkin_date, checkout_date) in enumerate(requested):
+                if conflicts.get(index):
                     return False, f"Room '{room_code}' is not available for the selected dates"
 
             return True, "All rooms available"
@@ -172,10 +320,47 @@ class ReservationService:
         except Exception as e:
             return False, f"Availability check error: {str(e)}"
 
-    def update_hotel_reservation(self, siteminder_id, customer_info, room_stay_info):
+    def room_stays_changed(self, reservation, room_stay_info, lookup, hotel_tz):
+        """Whether a room's incoming stay dates differ from its current room lines.
+
+        Each RoomStay carries its own dates, so a room can move inside an
+        unchanged reservation check-in/check-out range.
+        """
+
+        if not room_stay_info or not room_stay_info.get('room_types'):
+            return False
+        room_lines = get_env()['hotel.room.reservation.line'].sudo().search([
+            ('reservation_id', '=', reservation.id)
+        ])
+        if not room_lines:
+            return False
+
+        def local_date(value):
+            return value and self.datetime_helper.to_local(value, hotel_tz).date()
+
+        incoming = Counter(
+            (
+                RoomResolver.get_room(lookup, room_type_data.get('room_id', '')).id,
+                self.datetime_helper.parse_date(room_type_data.get('checkin_date') or room_stay_info.get('checkin_date')),
+                self.datetime_helper.parse_date(room_type_data.get('checkout_date') or room_stay_info.get('checkout_date')),
+            )
+            for room_type_data in room_stay_info['room_types']
+        )
+        current = Counter(
+            (line.room_id.id, local_date(line.check_in), local_date(line.check_out))
+            for line in room_lines
+        )
+        return incoming != current
+
+    def update_hotel_reservation(self, siteminder_id, customer_info, room_stay_info, lookup=None):
 
         try:
-            existing_reservation = self.find_reservation_by_siteminder_id(siteminder_id)
+            if lookup is None:
+                lookup = self.prefetch_batch_lookup([{
+                    'customer_info': dict(customer_info or {}, siteminder_id=siteminder_id),
+                    'room_stay_info': room_stay_info or {},
+                }])
+            existing_reservation = lookup['reservations'].get(siteminder_id)
             if not existing_reservation:
                 return {
                     'success': False,
@@ -184,33 +369,9 @@ class ReservationService:
                 }
 
 
-            if existing_reservation.state != 'draft':
-                try:
-
-                    existing_reservation.sudo().cancel_reservation()
-                    existing_reservation.sudo().set_to_draft_reservation()
-                except Exception as e:
-                    return {
-                        'success': False,
-                        'error': f'Could not reset reservation to draft state: {str(e)}',
-                        'error_type': 'state_error'
-                    }
-
-
-            hotelRoomReservationLine = request.env['hotel.room.reservation.line']
-            remaining_room_lines = hotelRoomReservationLine.sudo().search([
-                ('reservation_id', '=', existing_reservation.id)
-            ])
-            if remaining_room_lines:
-
-                for line in remaining_room_lines:
-                    if line.room_id:
-                        line.room_id.write({"isroom": True, "status": "available"})
-                remaining_room_lines.unlink()
-
-
             update_vals = {}
-            current_time = datetime.now().strftime("%H:%M:%S")
+            hotel_tz = self.datetime_helper.hotel_timezone()
+            current_time = self.datetime_helper.hotel_time(hotel_tz)
 
 
             if customer_info:
@@ -226,18 +387,19 @@ class ReservationService:
                     if not ((current_status == 'paid' and new_status in ['partial_paid', 'not_paid']) or (current_status == 'partial_paid' and new_status == 'not_paid')):
                         update_vals['payment'] = new_status
 
+            line_commands = []
             if room_stay_info:
 
                 if room_stay_info.get('checkin_date'):
-                    checkin_datetime_obj = self.datetime_helper.parse_and_format_datetime(
-                        room_stay_info['checkin_date'], current_time
+                    checkin_datetime_obj = self.datetime_helper.stay_datetime(
+                        room_stay_info['checkin_date'], current_time, hotel_tz
                     )
                     if checkin_datetime_obj:
                         update_vals['checkin'] = fields.Datetime.from_string(checkin_datetime_obj)
 
                 if room_stay_info.get('checkout_date'):
-                    checkout_datetime_obj = self.datetime_helper.parse_and_format_datetime(
-                        room_stay_info['checkout_date'], current_time
+                    checkout_datetime_obj = self.datetime_helper.stay_datetime(
+                        room_stay_info['checkout_date'], current_time, hotel_tz
                     )
                     if checkout_datetime_obj:
                         update_vals['checkout'] = fields.Datetime.from_string(checkout_datetime_obj)
@@ -251,51 +413,87 @@ class ReservationService:
 
                 if room_stay_info.get('room_types'):
                     try:
-
-                        if room_stay_info.get('checkin_date') and room_stay_info.get('checkout_date'):
-                            is_available, availability_msg = self.validate_room_availability_for_update(
-                                existing_reservation.id, room_stay_info
-                            )
-                            if not is_available:
-                                return {
-                                    'success': False,
-                                    'error': availability_msg,
-                                    'error_type': 'availability_error'
-                                }
-
-
-                        existing_reservation.sudo().reservation_line.unlink()
-
-
                         new_reservation_lines = self.create_reservation_lines(
                             room_stay_info['room_types'],
-                            customer_info.get("amount_after_tax")
+                            customer_info.get("amount_after_tax"),
+                            lookup
                         )
-                        update_vals['reservation_line'] = new_reservation_lines
-
-
-                        is_valid, total_guests, total_capacity = self.validate_room_capacity(room_stay_info)
-                        if not is_valid:
-                            return {
-                                'success': False,
-                                'error': f'Insufficient room capacity: {total_guests} guests require {total_capacity} total capacity',
-                                'error_type': 'capacity_error'
-                            }
-
                     except ValueError as ve:
                         return {
                             'success': False,
                             'error': str(ve),
                             'error_type': 'validation_error'
                         }
+                    line_commands = ReservationDiffEngine.diff_lines(existing_reservation, new_reservation_lines)
+
+            update_vals = ReservationDiffEngine.diff_header(existing_reservation, update_vals, hotel_tz)
+            rooms_changed = (
+                ReservationDiffEngine.lines_changed(line_commands)
+                or 'checkin' in update_vals or 'checkout' in update_vals
+                or self.room_stays_changed(existing_reservation, room_stay_info, lookup, hotel_tz)
+            )
+
+            if rooms_changed:
+                if room_stay_info.get('checkin_date') and room_stay_info.get('checkout_date'):
+                    is_available, availability_msg = self.validate_room_availability_for_update(
+                        existing_reservation.id, room_stay_info, lookup
+                    )
+                    if not is_available:
+                        return {
+                            'success': False,
+                            'error': availability_msg,
+                            'error_type': 'availability_error'
+                        }
+
+            # Guests can grow on unchanged rooms, so capacity is checked on every modification.
+            if room_stay_info.get('room_types'):
+                try:
+                    is_valid, total_guests, total_capacity, details = self.validate_room_capacity(room_stay_info, lookup)
+                except ValueError as ve:
+                    return {
+                        'success': False,
+                        'error': str(ve),
+                        'error_type': 'validation_error'
+                    }
+                if not is_valid:
+                    return {
+                        'success': False,
+                        'error': self.capacity_error_message(total_guests, total_capacity, details),
+                        'error_type': 'capacity_error'
+                    }
+
+            if rooms_changed:
+                if existing_reservation.state != 'draft':
+                    try:
+
+                        existing_reservation.sudo().cancel_reservation()
+                        existing_reservation.sudo().set_to_draft_reservation()
+                    except Exception as e:
+                        return {
+                            'success': False,
+                            'error': f'Could not reset reservation to draft state: {str(e)}',
+                            'error_type': 'state_error'
+                        }
+
+
+                hotelRoomReservationLine = get_env()['hotel.room.reservation.line']
+                remaining_room_lines = hotelRoomReservationLine.sudo().search([
+                    ('reservation_id', '=', existing_reservation.id)
+                ])
+                if remaining_room_lines:
 
+                    self.set_rooms_status(remaining_room_lines.room_id, 'available')
+                    remaining_room_lines.unlink()
+
+            if line_commands:
+                update_vals['reservation_line'] = line_commands
 
             if update_vals:
                 existing_reservation.sudo().write(update_vals)
 
 
             existing_reservation.sudo().invalidate_cache()
-            updated_reservation = request.env['hotel.reservation'].sudo().browse(existing_reservation.id)
+            updated_reservation = get_env()['hotel.reservation'].sudo().browse(existing_reservation.id)
 
             return {
                 'success': True,
@@ -308,46 +506,62 @@ class ReservationService:
                 'children': updated_reservation.children,
                 'email': updated_reservation.email,
                 'phone': updated_reservation.ph_no,
-                'state': 'draft',
-                'message': 'Reservation updated successfully and set to draft state'
+                'state': updated_reservation.state,
+                'changed_fields': sorted(update_vals),
+                'message': (
+                    'Reservation updated successfully and set to draft state' if rooms_changed
+                    else 'Reservation updated successfully'
+                )
+            }
+
+        except psycopg2.OperationalError as e:
+            if e.pgcode == LOCK_NOT_AVAILABLE:
+                return self._lock_timeout_result()
+            return {
+                'success': False,
+                'error': f'Update error: {str(e)}',
+                'error_type': 'system_error'
             }
 
         except Exception as e:
-            import traceback
             return {
                 'success': False,
                 'error': f'Update error: {str(e)}',
                 'error_type': 'system_error'
             }
 
-    def create_hotel_reservation(self, customer_info, room_stay_info):
+    def create_hotel_reservation(self, customer_info, room_stay_info, lookup=None):
 
 
         try:
-            current_time = datetime.now().strftime("%H:%M:%S")
+            if lookup is None:
+                lookup = self.prefetch_batch_lookup([{'customer_info': customer_info, 'room_stay_info': room_stay_info}])
+            hotel_tz = self.datetime_helper.hotel_timezone()
+            current_time = self.datetime_helper.hotel_time(hotel_tz)
 
 
-            checkin_datetime_obj = self.datetime_helper.parse_and_format_datetime(
-                room_stay_info['checkin_date'], current_time
+            checkin_datetime_obj = self.datetime_helper.stay_datetime(
+                room_stay_info['checkin_date'], current_time, hotel_tz
             )
-            checkout_datetime_obj = self.datetime_helper.parse_and_format_datetime(
-                room_stay_info['checkout_date'], current_time
+            checkout_datetime_obj = self.datetime_helper.stay_datetime(
+                room_stay_info['checkout_date'], current_time, hotel_tz
             )
-            is_valid, total_guests, total_capacity = self.validate_room_capacity(room_stay_info)
+            is_valid, total_guests, total_capacity, details = self.validate_room_capacity(room_stay_info, lookup)
 
 
             if not is_valid:
 
                 return {
                     'success': False,
-                    'error': f'Insufficient room capacity: {total_guests} guests require {total_capacity} total capacity',
+                    'error': self.capacity_error_message(total_guests, total_capacity, details),
                     'error_type': 'capacity_error'
                 }
 
             try:
                 reservation_lines = self.create_reservation_lines(
                     room_stay_info['room_types'],
-                    customer_info.get("amount_after_tax")
+                    customer_info.get("amount_after_tax"),
+                    lookup
                 )
             except ValueError as ve:
 
@@ -371,7 +585,7 @@ class ReservationService:
             siteminder_id = room_stay_info.get('siteminder_id', '')
 
             reservation_vals = {
-                'date_order': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'date_order': fields.Datetime.now(),
                 'company_id': 1,
                 'partner_id': 149,
                 'customer_name': customer_info['name'],
@@ -393,20 +607,36 @@ class ReservationService:
                 'room_price_summary': room_price_summary,
                 'siteminder_id': siteminder_id
             }
-            reservation = request.env['hotel.reservation'].sudo().create(reservation_vals)
+            reservation = get_env()['hotel.reservation'].sudo().create(reservation_vals)
 
 
-            custom_reservation_no = self.reservation_number_generator.generate_next_reservation_number()
+            with metrics.stage("reservation_number"):
+                custom_reservation_no = self.reservation_number_generator.generate_next_reservation_number()
             reservation.sudo().write({'reservation_no': custom_reservation_no})
 
 
             checkin_datetime = fields.Datetime.from_string(checkin_datetime_obj)
             checkout_datetime = fields.Datetime.from_string(checkout_datetime_obj)
 
+            room_stays = []
+            for room_type_data in room_stay_info['room_types']:
+                stay_checkin = self.datetime_helper.stay_datetime(
+                    room_type_data.get('checkin_date'), current_time, hotel_tz
+                )
+                stay_checkout = self.datetime_helper.stay_datetime(
+                    room_type_data.get('checkout_date'), current_time, hotel_tz
+                )
+                room_stays.append((
+                    RoomResolver.get_room(lookup, room_type_data.get('room_id', '')),
+                    stay_checkin or checkin_datetime,
+                    stay_checkout or checkout_datetime,
+                ))
+
             room_lines_result = self.create_room_reservation_lines(
                 reservation.id,
                 checkin_datetime,
-                checkout_datetime
+                checkout_datetime,
+                room_stays
             )
 
             if not room_lines_result['success']:
@@ -425,6 +655,28 @@ class ReservationService:
                 'message': 'Reservation and room lines created successfully'
             }
 
+        except psycopg2.IntegrityError as e:
+            if e.pgcode == UNIQUE_VIOLATION and e.diag.constraint_name == SITEMINDER_ID_UNIQUE_INDEX:
+                return {
+                    'success': False,
+                    'error': f"Reservation {room_stay_info.get('siteminder_id', '')} is already being created by another request",
+                    'error_type': 'concurrency_error'
+                }
+            return {
+                'success': False,
+                'error': str(e),
+                'error_type': 'creation_error'
+            }
+
+        except psycopg2.OperationalError as e:
+            if e.pgcode == LOCK_NOT_AVAILABLE:
+                return self._lock_timeout_result()
+            return {
+                'success': False,
+                'error': str(e),
+                'error_type': 'creation_error'
+            }
+
         except Exception as e:
 
             return {
@@ -0,0 +1,150 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .service_Env import get_env
+
+METRICS_TOKEN_PARAM = "psn_api.metrics_token"
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+_side_queries = threading.local()
+
+
+def add_side_queries(count):
+    """Credit queries run on a short-lived cursor of this thread to the enclosing stages."""
+    _side_queries.count = getattr(_side_queries, "count", 0) + count
+
+
+def _query_count():
+    # Odoo's cursor counts every execute(); outside a request there is none.
+    side = getattr(_side_queries, "count", 0)
+    try:
+        return get_env().cr.sql_log_count + side
+    except (AttributeError, RuntimeError):
+        return side
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f'{name}_sum{{{labels}}} {_format_value(self.total)}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Per-worker stage timings, SQL query counts and error counters.
+
+    Every Odoo worker process keeps its own registry; the metrics endpoint
+    reports the worker that served the scrape, labelled with its pid.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._durations = {}
+            self._queries = {}
+            self._errors = {}
+            self._push_errors = {}
+            self._requests = {}
+
+    @contextmanager
+    def stage(self, name):
+        queries_before = _query_count()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(name, time.perf_counter() - started, _query_count() - queries_before)
+
+    def observe_stage(self, name, duration, queries):
+        with self._lock:
+            if name not in self._durations:
+                self._durations[name] = Histogram(DURATION_BUCKETS)
+                self._queries[name] = Histogram(QUERY_BUCKETS)
+            self._durations[name].observe(duration)
+            self._queries[name].observe(queries)
+
+    def record_error(self, error_type):
+        with self._lock:
+            self._errors[error_type] = self._errors.get(error_type, 0) + 1
+
+    def record_push_error(self, error_type):
+        with self._lock:
+            self._push_errors[error_type] = self._push_errors.get(error_type, 0) + 1
+
+    def record_request(self, outcome):
+        with self._lock:
+            self._requests[outcome] = self._requests.get(outcome, 0) + 1
+
+    def render(self):
+        worker = f'worker="{os.getpid()}"'
+        with self._lock:
+            lines = [
+                '# HELP psn_api_stage_duration_seconds Time spent in each /api/reservation stage.',
+                '# TYPE psn_api_stage_duration_seconds histogram',
+            ]
+            for name in sorted(self._durations):
+                lines.extend(self._durations[name].render(
+                    'psn_api_stage_duration_seconds', f'{worker},stage="{name}"'
+                ))
+            lines += [
+                '# HELP psn_api_stage_sql_queries SQL queries executed in each /api/reservation stage.',
+                '# TYPE psn_api_stage_sql_queries histogram',
+            ]
+            for name in sorted(self._queries):
+                lines.extend(self._queries[name].render('psn_api_stage_sql_queries', f'{worker},stage="{name}"'))
+            lines += [
+                '# HELP psn_api_errors_total Reservations rejected, by error type.',
+                '# TYPE psn_api_errors_total counter',
+            ]
+            for error_type in sorted(self._errors):
+                lines.append(f'psn_api_errors_total{{{worker},error_type="{error_type}"}} {self._errors[error_type]}')
+            lines += [
+                '# HELP psn_api_availability_push_errors_total Failed availability pushes, by error type.',
+                '# TYPE psn_api_availability_push_errors_total counter',
+            ]
+            for error_type in sorted(self._push_errors):
+                lines.append(
+                    f'psn_api_availability_push_errors_total{{{worker},error_type="{error_type}"}} '
+                    f'{self._push_errors[error_type]}'
+                )
+            lines += [
+                '# HELP psn_api_requests_total /api/reservation requests, by outcome.',
+                '# TYPE psn_api_requests_total counter',
+            ]
+            for outcome in sorted(self._requests):
+                lines.append(f'psn_api_requests_total{{{worker},outcome="{outcome}"}} {self._requests[outcome]}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
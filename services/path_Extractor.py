@@ -0,0 +1,124 @@
+import re
+
+_SPLIT = re.compile(r"(?:[^/\[]|\[[^\]]*\])+|(?<=/)(?=/|$)|^(?=/)")
+_STEP = re.compile(r"""^(?P<name>[@#]?[\w:.-]+)(?:\[(?P<filter>[^=\]]+)=(?P<quote>['"])(?P<value>.*?)(?P=quote)\])?$""")
+
+
+class Path:
+    """Declaration of one field in the xmltodict output of an OTA message.
+
+    ``path`` is a ``/``-separated list of steps:
+
+    * ``Name`` descends into a child element. A repeated element (a list)
+      yields its first item, or every item when ``many`` is set.
+    * ``Name[Sub/@attr='value']`` keeps only the items whose sub-path
+      equals ``value``.
+    * ``@attr`` reads an attribute; ``#text`` reads the text of an element
+      whether it was parsed as a plain string or as a dict with attributes.
+    """
+
+    def __init__(self, path, default=None, many=False):
+        self.path = path
+        self.default = default
+        self.many = many
+
+
+def _parse(path):
+    steps = []
+    for raw_step in _SPLIT.findall(path) or [path]:
+        match = _STEP.match(raw_step.strip())
+        if not match:
+            raise ValueError(f"Invalid path step {raw_step!r} in {path!r}")
+        steps.append((match.group("name"), match.group("filter"), match.group("value")))
+    for name, _, _ in steps[:-1]:
+        if name[0] in "@#":
+            raise ValueError(f"{name!r} can only be the last step of {path!r}")
+    return steps
+
+
+def _emit_single(steps, namespace, lines, indent):
+    pad = " " * indent
+    for index, (name, filter_path, filter_value) in enumerate(steps):
+        if name == "#text":
+            lines.append(f"{pad}if node.__class__ is dict:")
+            lines.append(f"{pad}    node = node.get('#text')")
+            continue
+        lines.append(f"{pad}if node.__class__ is not dict:")
+        lines.append(f"{pad}    return default")
+        lines.append(f"{pad}node = node.get({name!r})")
+        if name[0] == "@":
+            continue
+        if filter_path is None:
+            lines.append(f"{pad}if node.__class__ is list:")
+            lines.append(f"{pad}    node = node[0] if node else None")
+        else:
+            predicate = f"_filter{index}"
+            namespace[predicate] = compile_path(filter_path)
+            lines.append(f"{pad}for node in (node if node.__class__ is list else (node,)):")
+            lines.append(f"{pad}    if {predicate}(node) == {filter_value!r}:")
+            lines.append(f"{pad}        break")
+            lines.append(f"{pad}else:")
+            lines.append(f"{pad}    return default")
+    lines.append(f"{pad}return default if node is None else node")
+
+
+def _emit_many(steps, namespace, lines, indent, depth=0):
+    pad = " " * indent
+    node, child = f"node{depth}", f"node{depth + 1}"
+    if not steps:
+        lines.append(f"{pad}if {node} is not None:")
+        lines.append(f"{pad}    values.append({node})")
+        return
+    (name, filter_path, filter_value), rest = steps[0], steps[1:]
+    if name == "#text":
+        lines.append(f"{pad}{child} = {node}.get('#text') if {node}.__class__ is dict else {node}")
+        _emit_many(rest, namespace, lines, indent, depth + 1)
+        return
+    lines.append(f"{pad}if {node}.__class__ is dict:")
+    lines.append(f"{pad}    {child} = {node}.get({name!r})")
+    if name[0] == "@":
+        _emit_many(rest, namespace, lines, indent + 4, depth + 1)
+        return
+    lines.append(f"{pad}    for {child} in ({child} if {child}.__class__ is list else ({child},)):")
+    if filter_path is None:
+        _emit_many(rest, namespace, lines, indent + 8, depth + 1)
+    else:
+        predicate = f"_filter{depth}"
+        namespace[predicate] = compile_path(filter_path)
+        lines.append(f"{pad}        if {predicate}({child}) == {filter_value!r}:")
+        _emit_many(rest, namespace, lines, indent + 12, depth + 1)
+
+
+def compile_path(path, default=None, many=False):
+    """Compile a path into a function of one node.
+
+    The function is generated as straight-line Python, so extraction costs
+    one class check and one dict lookup per step. ``many`` paths return a
+    list of every match, others the first match or ``default``.
+    """
+
+    if isinstance(path, Path):
+        path, default, many = path.path, path.default, path.many
+
+    namespace = {"default": default}
+    if many:
+        lines = ["def extract(node0):", "    values = []"]
+        _emit_many(_parse(path), namespace, lines, 4)
+        lines.append("    return values")
+    else:
+        lines = ["def extract(node):"]
+        _emit_single(_parse(path), namespace, lines, 4)
+    exec(compile("\n".join(lines), f"<path {path}>", "exec"), namespace)
+    extract = namespace["extract"]
+    extract.__doc__ = path
+    return extract
+
+
+def compile_mapping(fields):
+    """Compile ``{key: Path or path string}`` into a function returning a dict."""
+
+    extractors = {key: compile_path(spec) for key, spec in fields.items()}
+    namespace = {f"_extract{index}": extractor for index, extractor in enumerate(extractors.values())}
+    body = ", ".join(f"{key!r}: _extract{index}(node)" for index, key in enumerate(extractors))
+    exec(f"def extract(node):\n    return {{{body}}}", namespace)
+    return namespace["extract"]
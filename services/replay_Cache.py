@@ -0,0 +1,54 @@
+import hashlib
+
+from odoo.http import request
+from .cus_Data_Extractor import extract_siteminder_id
+
+
+class ReplayCacheService:
+    """Replay the stored response when SiteMinder retries a message.
+
+    Messages are keyed on the EchoToken, the ResID_Value of every
+    reservation and a digest of the raw body, so only byte-identical
+    retries are answered from the cache.
+    """
+
+    TRANSIENT_ERROR_TYPES = ('system_error', 'concurrency_error')
+
+    @staticmethod
+    def extract_res_id_values(hotel_reservations):
+
+        return ",".join(extract_siteminder_id(hotel_reservation) for hotel_reservation in hotel_reservations)
+
+    @staticmethod
+    def build_key(echo_token, res_id_values, soap_body):
+
+        body_digest = hashlib.sha256(soap_body).hexdigest()
+        return hashlib.sha256(f"{echo_token}|{res_id_values}|{body_digest}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_replayable(results):
+
+        return not any(
+            result.get('error_type') in ReplayCacheService.TRANSIENT_ERROR_TYPES for result in results
+        )
+
+    @staticmethod
+    def find_response(key):
+
+        response_body = request.env['api.reservation.replay'].sudo().find_response(key)
+        if response_body is None:
+            return None
+        return request.make_response(
+            response_body,
+            headers=[
+                ('Content-Type', 'text/xml; charset=utf-8'),
+                ('Access-Control-Allow-Origin', '*')
+            ]
+        )
+
+    @staticmethod
+    def store_response(key, echo_token, res_id_values, response):
+
+        request.env['api.reservation.replay'].sudo().store_response(
+            key, echo_token, res_id_values, response.get_data(as_text=True)
+        )
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from .dataTime_Service import DateTimeHelper
+
+
+class ReservationDiffEngine:
+    """Compare an incoming modification with the stored reservation.
+
+    Only fields and lines that actually differ are returned, so a guest
+    e-mail change is one small write instead of a full cancel and rebuild.
+    """
+
+    DATE_FIELDS = ('checkin', 'checkout')
+
+    @staticmethod
+    def diff_header(reservation, vals, tz_name='UTC'):
+        """Changed header fields; check-in/out compare by hotel-local day (``tz_name``)."""
+
+        changes = {}
+        for field_name, value in vals.items():
+            current = reservation[field_name]
+            if field_name in ReservationDiffEngine.DATE_FIELDS:
+                # Incoming times are synthesized from the clock; only the local day is meaningful.
+                if (isinstance(current, datetime) and isinstance(value, datetime)
+                        and DateTimeHelper.to_local(current, tz_name).date()
+                        == DateTimeHelper.to_local(value, tz_name).date()):
+                    continue
+            elif (current or False) == (value or False):
+                continue
+            changes[field_name] = value
+        return changes
+
+    @staticmethod
+    def diff_lines(reservation, line_commands):
+        """Turn ``(0, 0, vals)`` commands into the minimal one2many command list.
+
+        Existing lines with the same room type and rooms are kept (with a
+        price update when needed), missing ones are created and leftover
+        ones are deleted.
+        """
+
+        existing = {}
+        for line in reservation.reservation_line:
+            existing.setdefault((line.categ_id.id, tuple(sorted(line.reserve.ids))), []).append(line)
+
+        commands = []
+        for command in line_commands:
+            vals = command[2]
+            key = (vals['categ_id'], tuple(sorted(vals['reserve'][0][2])))
+            if existing.get(key):
+                line = existing[key].pop(0)
+                price = vals.get('promotion_price')
+                if price is not None and line.promotion_price != price:
+                    commands.append((1, line.id, {'promotion_price': price}))
+            else:
+                commands.append(command)
+
+        for lines in existing.values():
+            commands.extend((2, line.id) for line in lines)
+        return commands
+
+    @staticmethod
+    def lines_changed(line_commands):
+
+        return any(command[0] in (0, 2) for command in line_commands)
@@ -1,24 +1,35 @@
-from odoo.http import request
+from .service_Env import get_env
+
+RESERVATION_SEQUENCE_CODE = "psn_api.reservation_no"
+
 
 class ReservationNumberGenerator:
 
     @staticmethod
     def generate_next_reservation_number():
-        hotelReservation = request.env['hotel.reservation']
+        # Backed by a native Postgres sequence: constant time and safe
+        # across concurrent workers.
+        return get_env()['ir.sequence'].sudo().next_by_code(RESERVATION_SEQUENCE_CODE)
 
-        all_reservations = hotelReservation.sudo().search([
-            ('reservation_no', 'like', 'R/')
-        ])
+    @staticmethod
+    def highest_reservation_number(cr):
+        cr.execute("""
+            SELECT MAX(CAST(SUBSTRING(reservation_no FROM '/([0-9]+)$') AS INTEGER))
+              FROM hotel_reservation
+             WHERE reservation_no LIKE '%R/%'
+               AND reservation_no ~ '/[0-9]+$'
+        """)
+        return cr.fetchone()[0] or 0
 
-        highest_number = 0
-        for reservation in all_reservations:
-            try:
-                if '/' in reservation.reservation_no:
-                    number_str = reservation.reservation_no.split('/')[-1]
-                    number = int(number_str)
-                    if number > highest_number:
-                        highest_number = number
-            except:
-                continue
-        next_number = highest_number + 1
-        return f"R/{next_number:05d}"
\ No newline at end of file
+    @staticmethod
+    def seed_reservation_sequence(env):
+        """Move the sequence past the highest R/ number already in use."""
+        sequence = env['ir.sequence'].sudo().search([('code', '=', RESERVATION_SEQUENCE_CODE)], limit=1)
+        if not sequence:
+            return
+        env.cr.execute("SELECT to_regclass('hotel_reservation')")
+        if not env.cr.fetchone()[0]:
+            return
+        highest_number = ReservationNumberGenerator.highest_reservation_number(env.cr)
+        if highest_number >= sequence.number_next_actual:
+            sequence.write({'number_next': highest_number + 1})
@@ -1,11 +1,133 @@
+import time
 import uuid
-from datetime import datetime
 from odoo.http import request
-import xml.etree.ElementTree as ET
+from .soap_Parser import SoapParsingEngine
+
+
+def _escape(value):
+    """Escape a value for XML text or a double-quoted attribute."""
+    if value.__class__ is not str:
+        value = str(value)
+    if '&' in value or '<' in value or '>' in value or '"' in value:
+        return value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+    return value
+
+
+_timestamp_cache = [0, '']
+
+
+def _timestamp():
+    """The UTC TimeStamp attribute, formatted at most once per second."""
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache[1] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now))
+        _timestamp_cache[0] = now
+    return _timestamp_cache[1]
+
+
+# A document is written into one bytearray. The envelope and the wrapping
+# elements are encoded once at import; each notice or reservation is an
+# f-string fragment, escaped by its writer and encoded straight into the
+# buffer, so the whole document never exists as a str.
+_ENVELOPE_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">\n'
+    '    <SOAP-ENV:Body>\n'
+    '        <OTA_HotelResNotifRS xmlns="http://www.opentravel.org/OTA/2003/05"\n'
+    '             Version="1.0" TimeStamp="'
+).encode()
+_ENVELOPE_CLOSE = (
+    '\n        </OTA_HotelResNotifRS>'
+    '\n    </SOAP-ENV:Body>'
+    '\n</SOAP-ENV:Envelope>'
+).encode()
+_ECHO_TOKEN = b'" EchoToken="'
+_ATTRIBUTES_END = b'">'
+
+_SUCCESS = b'\n            <Success/>'
+_WARNINGS_OPEN = b'\n            <Warnings>'
+_WARNINGS_CLOSE = b'\n            </Warnings>'
+_ERRORS_OPEN = b'\n            <Errors>'
+_ERRORS_CLOSE = b'\n            </Errors>'
+_RESERVATIONS_OPEN = b'\n            <HotelReservations>'
+_RESERVATIONS_CLOSE = b'\n            </HotelReservations>'
+_REJECTED = ' ResStatus="Rejected"'
+
+
+def _write_notice(write, tag, notice_type, code, message, rph=None):
+    if rph is None:
+        write(f"""
+                <{tag} Type="{notice_type}" Code="{code}">{_escape(message)}</{tag}>""".encode())
+    else:
+        write(f"""
+                <{tag} Type="{notice_type}" Code="{code}" RPH="{rph}">{_escape(message)}</{tag}>""".encode())
+
+
+def _write_reservation(write, reservation_no, siteminder_id=None):
+    reservation_no = _escape(reservation_no)
+    channel_id = '' if siteminder_id is None else _channel_id(_escape(siteminder_id))
+    write(f"""
+                <HotelReservation>
+                    <UniqueID ID="{reservation_no}"/>
+                    <ResGlobalInfo>
+                        <HotelReservationIDs>{channel_id}
+                            <HotelReservationID ResID_Type="10"
+                                 ResID_Value="{reservation_no}"/>
+                        </HotelReservationIDs>
+                    </ResGlobalInfo>
+                </HotelReservation>""".encode())
+
+
+def _channel_id(siteminder_id):
+    return f"""
+                            <HotelReservationID ResID_Type="14"
+                                 ResID_Value="{siteminder_id}"/>"""
+
+
+def _write_channel_reservation(write, siteminder_id, status=''):
+    write(f"""
+                <HotelReservation{status}>
+                    <ResGlobalInfo>
+                        <HotelReservationIDs>{_channel_id(_escape(siteminder_id))}
+                        </HotelReservationIDs>
+                    </ResGlobalInfo>
+                </HotelReservation>""".encode())
+
+
+def _open_document(echo_token):
+    """A buffer holding the envelope up to the response content."""
+    buffer = bytearray(_ENVELOPE_OPEN)
+    buffer += _timestamp().encode()
+    buffer += _ECHO_TOKEN
+    buffer += _escape(echo_token).encode()
+    buffer += _ATTRIBUTES_END
+    return buffer
+
+
+def _close_document(buffer):
+    buffer += _ENVELOPE_CLOSE
+    return bytes(buffer)
+
+
+_RESPONSE_HEADERS = [
+    ('Content-Type', 'text/xml; charset=utf-8'),
+    ('Access-Control-Allow-Origin', '*')
+]
 
 
 class ResponseBuilder:
 
+    ERROR_MAPPING = {
+        'validation_error': {'Type': '4', 'Code': '400'},  # Business rule validation error
+        'capacity_error': {'Type': '6', 'Code': '392'},  # No availability
+        'system_error': {'Type': '1', 'Code': '500'},  # System/processing error
+        'reservation_error': {'Type': '3', 'Code': '300'},  # Application error
+        'confirmation_error': {'Type': '3', 'Code': '301'},  # Application error - confirmation failed
+        'authentication_error': {'Type': '6', 'Code': '497'},  # Authentication failed
+        'concurrency_error': {'Type': '1', 'Code': '500'},  # Concurrent delivery, safe to retry
+        'unknown_error': {'Type': '1', 'Code': '500'}  # Default to system error
+    }
+
     @staticmethod
     def extract_echo_token(parse_data):
 
@@ -13,7 +135,7 @@ class ResponseBuilder:
 
             if isinstance(parse_data, dict):
 
-                echo_token = parse_data.get('EchoToken')
+                echo_token = parse_data.get('echo_token') or parse_data.get('EchoToken')
                 if echo_token:
                     return echo_token
 
@@ -23,13 +145,10 @@ class ResponseBuilder:
                         return value['EchoToken']
 
 
-            if isinstance(parse_data, str):
-                root = ET.fromstring(parse_data)
-
-                for elem in root.iter():
-                    echo_token = elem.get('EchoToken')
-                    if echo_token:
-                        return echo_token
+            if isinstance(parse_data, (str, bytes)):
+                soap_message = SoapParsingEngine().parse(parse_data)
+                if soap_message and soap_message.get('echo_token'):
+                    return soap_message['echo_token']
 
 
             return str(uuid.uuid4())
@@ -39,161 +158,138 @@ class ResponseBuilder:
             return str(uuid.uuid4())
 
     @staticmethod
-    def build_success_response(reservation_result, parse_data):
-
-
-        echo_token = ResponseBuilder.extract_echo_token(parse_data)
-        current_timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-        reservation_no = reservation_result.get('reservation_no', '')
-
+    def _make_response(body, status=200):
 
-        xml_response = f"""<?xml version="1.0" encoding="UTF-8"?>
-<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">
-    <SOAP-ENV:Body>
-        <OTA_HotelResNotifRS xmlns="http://www.opentravel.org/OTA/2003/05"
-             Version="1.0" TimeStamp="{current_timestamp}" EchoToken="{echo_token}">
-            <Success/>
-            <HotelReservations>
-                <HotelReservation>
-                    <UniqueID ID="{reservation_no}"/>
-                    <ResGlobalInfo>
-                        <HotelReservationIDs>
-                            <HotelReservationID ResID_Type="10"
-                                 ResID_Value="{reservation_no}"/>
-                        </HotelReservationIDs>
-                    </ResGlobalInfo>
-                </HotelReservation>
-            </HotelReservations>
-        </OTA_HotelResNotifRS>
-    </SOAP-ENV:Body>
-</SOAP-ENV:Envelope>"""
-
-        return request.make_response(
-            xml_response,
-            headers=[
-                ('Content-Type', 'text/xml; charset=utf-8'),
-                ('Access-Control-Allow-Origin', '*')
-            ]
-        )
+        response = request.make_response(body, headers=_RESPONSE_HEADERS)
+        response.status_code = status
+        return response
 
     @staticmethod
-    def build_success_with_warnings_response(reservation_result, parse_data, warnings):
-
-
-        echo_token = ResponseBuilder.extract_echo_token(parse_data)
-        current_timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-        reservation_no = reservation_result.get('reservation_no', '')
-
+    def render_success(reservation_result, parse_data, warnings=None):
 
-        warnings_xml = ""
+        buffer = _open_document(ResponseBuilder.extract_echo_token(parse_data))
+        write = buffer.extend
+        write(_SUCCESS)
         if warnings:
-            warnings_xml = "\n            <Warnings>"
+            write(_WARNINGS_OPEN)
             for warning in warnings:
-                warnings_xml += f'\n                <Warning Type="{warning["type"]}" Code="{warning["code"]}">{warning["message"]}</Warning>'
-            warnings_xml += "\n            </Warnings>"
+                _write_notice(write, 'Warning', warning['type'], warning['code'], warning['message'])
+            write(_WARNINGS_CLOSE)
+        write(_RESERVATIONS_OPEN)
+        _write_reservation(write, reservation_result.get('reservation_no') or '')
+        write(_RESERVATIONS_CLOSE)
+        return _close_document(buffer)
 
+    @staticmethod
+    def render_batch(results, parse_data):
+        """One HotelReservation per input reservation, in request order.
+
+        Failed reservations are reported with a Warning (or an Error when the
+        whole batch failed) whose RPH points at the reservation's position.
+        """
+
+        error_mapping = ResponseBuilder.ERROR_MAPPING
+        any_success = any(result.get('success') for result in results)
+        failure_tag = 'Warning' if any_success else 'Error'
+
+        buffer = _open_document(ResponseBuilder.extract_echo_token(parse_data))
+        write = buffer.extend
+        if any_success:
+            write(_SUCCESS)
+        has_notices = any(not result.get('success') or result.get('warnings') for result in results)
+        if has_notices:
+            write(_WARNINGS_OPEN if any_success else _ERRORS_OPEN)
+            for rph, result in enumerate(results, start=1):
+                if result.get('success'):
+                    for warning in result.get('warnings', []):
+                        _write_notice(write, 'Warning', warning['type'], warning['code'], warning['message'], rph)
+                else:
+                    error_info = error_mapping.get(result.get('error_type'), error_mapping['unknown_error'])
+                    _write_notice(
+                        write, failure_tag, error_info['Type'], error_info['Code'],
+                        result.get('error') or 'Unknown error occurred', rph
+                    )
+            write(_WARNINGS_CLOSE if any_success else _ERRORS_CLOSE)
+        elif not any_success:
+            write(_ERRORS_OPEN)
+            write(_ERRORS_CLOSE)
+
+        write(_RESERVATIONS_OPEN)
+        for result in results:
+            siteminder_id = result.get('siteminder_id') or ''
+            if result.get('success'):
+                _write_reservation(write, result.get('reservation_no') or '', siteminder_id)
+            else:
+                _write_channel_reservation(write, siteminder_id, _REJECTED)
+        write(_RESERVATIONS_CLOSE)
+        return _close_document(buffer)
 
-        xml_response = f"""<?xml version="1.0" encoding="UTF-8"?>
-<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">
-    <SOAP-ENV:Body>
-        <OTA_HotelResNotifRS xmlns="http://www.opentravel.org/OTA/2003/05"
-             Version="1.0" TimeStamp="{current_timestamp}" EchoToken="{echo_token}">
-            <Success/>{warnings_xml}
-            <HotelReservations>
-                <HotelReservation>
-                    <UniqueID ID="{reservation_no}"/>
-                    <ResGlobalInfo>
-                        <HotelReservationIDs>
-                            <HotelReservationID ResID_Type="10"
-                                 ResID_Value="{reservation_no}"/>
-                        </HotelReservationIDs>
-                    </ResGlobalInfo>
-                </HotelReservation>
-            </HotelReservations>
-        </OTA_HotelResNotifRS>
-    </SOAP-ENV:Body>
-</SOAP-ENV:Envelope>"""
-
-        return request.make_response(
-            xml_response,
-            headers=[
-                ('Content-Type', 'text/xml; charset=utf-8'),
-                ('Access-Control-Allow-Origin', '*')
-            ]
-        )
+    @staticmethod
+    def render_acknowledgement(parse_data, res_id_values):
 
+        buffer = _open_document(ResponseBuilder.extract_echo_token(parse_data))
+        write = buffer.extend
+        write(_SUCCESS)
+        write(_RESERVATIONS_OPEN)
+        for res_id_value in res_id_values:
+            _write_channel_reservation(write, res_id_value)
+        write(_RESERVATIONS_CLOSE)
+        return _close_document(buffer)
 
+    @staticmethod
+    def render_error(error_message, error_type="system_error", parse_data=None):
 
+        error_mapping = ResponseBuilder.ERROR_MAPPING
+        error_info = error_mapping.get(error_type, error_mapping['unknown_error'])
+        echo_token = ResponseBuilder.extract_echo_token(parse_data) if parse_data else str(uuid.uuid4())
+        buffer = _open_document(echo_token)
+        write = buffer.extend
+        write(_ERRORS_OPEN)
+        _write_notice(write, 'Error', error_info['Type'], error_info['Code'], error_message)
+        write(_ERRORS_CLOSE)
+        return _close_document(buffer)
 
     @staticmethod
-    def build_error_response(error_message, error_type="system_error", parse_data=None):
+    def render_authentication_error(error_message):
 
+        buffer = _open_document(str(uuid.uuid4()))
+        write = buffer.extend
+        write(_ERRORS_OPEN)
+        _write_notice(write, 'Error', '1', '401', error_message)
+        write(_ERRORS_CLOSE)
+        return _close_document(buffer)
 
-        echo_token = ResponseBuilder.extract_echo_token(parse_data) if parse_data else str(uuid.uuid4())
-        current_timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    @staticmethod
+    def build_success_response(reservation_result, parse_data):
 
+        return ResponseBuilder._make_response(ResponseBuilder.render_success(reservation_result, parse_data))
 
-        error_mapping = {
-            'validation_error': {'Type': '4', 'Code': '400'},  # Business rule validation error
-            'capacity_error': {'Type': '6', 'Code': '392'},  # No availability
-            'system_error': {'Type': '1', 'Code': '500'},  # System/processing error
-            'reservation_error': {'Type': '3', 'Code': '300'},  # Application error
-            'confirmation_error': {'Type': '3', 'Code': '301'},  # Application error - confirmation failed
-            'authentication_error': {'Type': '6', 'Code': '497'},  # Authentication failed
-            'unknown_error': {'Type': '1', 'Code': '500'}  # Default to system error
-        }
+    @staticmethod
+    def build_success_with_warnings_response(reservation_result, parse_data, warnings):
 
-        error_info = error_mapping.get(error_type, error_mapping['unknown_error'])
+        return ResponseBuilder._make_response(
+            ResponseBuilder.render_success(reservation_result, parse_data, warnings)
+        )
 
+    @staticmethod
+    def build_batch_response(results, parse_data):
 
-        xml_response = f"""<?xml version="1.0" encoding="UTF-8"?>
-<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">
-    <SOAP-ENV:Body>
-        <OTA_HotelResNotifRS xmlns="http://www.opentravel.org/OTA/2003/05"
-             Version="1.0" TimeStamp="{current_timestamp}" EchoToken="{echo_token}">
-            <Errors>
-                <Error Type="{error_info['Type']}" Code="{error_info['Code']}">{error_message}</Error>
-            </Errors>
-        </OTA_HotelResNotifRS>
-    </SOAP-ENV:Body>
-</SOAP-ENV:Envelope>"""
-
-        response = request.make_response(
-            xml_response,
-            headers=[
-                ('Content-Type', 'text/xml; charset=utf-8'),
-                ('Access-Control-Allow-Origin', '*')
-            ]
-        )
-        response.status_code = 200
-        return response
+        return ResponseBuilder._make_response(ResponseBuilder.render_batch(results, parse_data))
+
+    @staticmethod
+    def build_acknowledgement_response(parse_data, res_id_values):
+        """Success without our reservation numbers, sent when the message was queued."""
 
+        return ResponseBuilder._make_response(ResponseBuilder.render_acknowledgement(parse_data, res_id_values))
 
+    @staticmethod
+    def build_error_response(error_message, error_type="system_error", parse_data=None):
 
+        return ResponseBuilder._make_response(
+            ResponseBuilder.render_error(error_message, error_type, parse_data)
+        )
 
     @staticmethod
     def build_authentication_error_response(error_message):
 
-        current_timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-        fallback_token = str(uuid.uuid4())
-
-        xml_response = f"""<?xml version="1.0" encoding="UTF-8"?>
-<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/">
-    <SOAP-ENV:Body>
-        <OTA_HotelResNotifRS xmlns="http://www.opentravel.org/OTA/2003/05"
-             Version="1.0" TimeStamp="{current_timestamp}" EchoToken="{fallback_token}">
-            <Errors>
-                <Error Type="1" Code="401">{error_message}</Error>
-            </Errors>
-        </OTA_HotelResNotifRS>
-    </SOAP-ENV:Body>
-</SOAP-ENV:Envelope>"""
-
-        return request.make_response(
-            xml_response,
-            status=200,
-            headers=[
-                ('Content-Type', 'text/xml; charset=utf-8'),
-                ('Access-Control-Allow-Origin', '*')
-            ]
-        )
\ No newline at end of file
+        return ResponseBuilder._make_response(ResponseBuilder.render_authentication_error(error_message))
@@ -0,0 +1,81 @@
+from .service_Env import get_env
+
+DEFAULT_CAPACITY_PARAM = "psn_api.default_room_capacity"
+DEFAULT_ROOM_CAPACITY = 2
+
+
+class RoomResolver:
+    """Resolve every RoomID and RoomType name of a message in one query per model.
+
+    The returned dict (``{'rooms': {name: room}, 'room_types': {name: type}}``)
+    is shared by line creation, capacity validation and availability checks.
+    """
+
+    @staticmethod
+    def resolve(room_types):
+
+        room_type_names = {room_type_data.get('room_type', '') for room_type_data in room_types}
+        room_names = {room_type_data.get('room_id', '') for room_type_data in room_types}
+
+        resolved = {'room_types': {}, 'rooms': {}}
+        if room_type_names:
+            hotelRoomType = get_env()['hotel.room.type'].sudo()
+            for room_type in hotelRoomType.search([('name', 'in', list(room_type_names))]):
+                resolved['room_types'].setdefault(room_type.name, room_type)
+        if room_names:
+            hotelRoom = get_env()['hotel.room'].sudo()
+            for room in hotelRoom.search([('name', 'in', list(room_names))]):
+                resolved['rooms'].setdefault(room.name, room)
+        return resolved
+
+    @staticmethod
+    def get_room(resolved, room_name):
+
+        return resolved['rooms'].get(room_name) or get_env()['hotel.room'].sudo()
+
+    @staticmethod
+    def get_room_type(resolved, room_type_name):
+
+        return resolved['room_types'].get(room_type_name) or get_env()['hotel.room.type'].sudo()
+
+    @staticmethod
+    def missing_rooms(room_types, resolved):
+
+        missing = []
+        for room_type_data in room_types:
+            room_name = room_type_data.get('room_id', '')
+            if room_name not in resolved['rooms'] and room_name not in missing:
+                missing.append(room_name)
+        return missing
+
+    @staticmethod
+    def missing_room_type_pairs(room_types, resolved):
+
+        missing = []
+        for room_type_data in room_types:
+            pair = (room_type_data.get('room_type', ''), room_type_data.get('room_id', ''))
+            if (pair[0] not in resolved['room_types'] or pair[1] not in resolved['rooms']) and pair not in missing:
+                missing.append(pair)
+        return missing
+
+    @staticmethod
+    def default_capacity():
+
+        value = get_env()['ir.config_parameter'].sudo().get_param(DEFAULT_CAPACITY_PARAM)
+        try:
+            return int(value) if value else DEFAULT_ROOM_CAPACITY
+        except ValueError:
+            return DEFAULT_ROOM_CAPACITY
+
+    @staticmethod
+    def capacities(rooms):
+        """``{room_id: capacity}`` read in one go; an unset capacity falls back to the configured default."""
+
+        default = RoomResolver.default_capacity()
+        hotelRoom = get_env()['hotel.room'].sudo().browse([room.id for room in rooms])
+        if 'capacity' not in hotelRoom._fields:
+            return {room_id: default for room_id in hotelRoom.ids}
+        return {
+            row['id']: default if row['capacity'] in (False, None) else row['capacity']
+            for row in hotelRoom.read(['capacity'])
+        }
@@ -1,3 +1,28 @@
+from .dataTime_Service import DateTimeHelper
+from .path_Extractor import Path, compile_path, compile_mapping
+
+_ROOM_STAYS = compile_path('RoomStays/RoomStay', many=True)
+
+_ROOM_STAY_FIELDS = compile_mapping({
+    'checkin_date': Path('TimeSpan/@Start', default=''),
+    'checkout_date': Path('TimeSpan/@End', default=''),
+    'guest_counts': Path('GuestCounts/GuestCount', many=True),
+    'room_types': Path('RoomTypes/RoomType', many=True),
+})
+
+_GUEST_COUNT_FIELDS = compile_mapping({
+    'age_code': Path('@AgeQualifyingCode', default=''),
+    'count': Path('@Count', default=1),
+})
+
+_ROOM_TYPE_FIELDS = compile_mapping({
+    'room_type_code': Path('@RoomTypeCode', default=''),
+    'room_type': Path('@RoomType', default=''),
+    'room_id': Path('@RoomID', default=''),
+    'description': Path('RoomDescription/Text/#text', default=''),
+})
+
+
 class RoomStayExtractor:
 
 
@@ -7,87 +32,76 @@ class RoomStayExtractor:
             if not isinstance(hotel_reservation, dict):
                 raise ValueError("Invalid hotel_reservation format (not a dict)")
 
-            room_stays_container = hotel_reservation.get('RoomStays', {})
-            room_stays = room_stays_container.get('RoomStay', [])
-
-            if not isinstance(room_stays, list):
-                room_stays = [room_stays]
-
-            if not room_stays:
+            stays = [
+                RoomStayExtractor._extract_single_room_stay(room_stay)
+                for room_stay in _ROOM_STAYS(hotel_reservation) if room_stay.__class__ is dict
+            ]
+            if not stays:
                 return None
 
-            first_room_stay = room_stays[0]
-
-            # Extract dates
-            time_span = first_room_stay.get('TimeSpan', {})
-            checkin_date = time_span.get('@Start', '')
-            checkout_date = time_span.get('@End', '')
-
-            # Extract guest counts
-            guest_counts_container = first_room_stay.get('GuestCounts', {})
-            guest_counts = guest_counts_container.get('GuestCount', [])
-
-            if not isinstance(guest_counts, list):
-                guest_counts = [guest_counts]
-
-            adults = children = 0
-
-
-            for guest_count in guest_counts:
-                if not isinstance(guest_count, dict):
-                    continue
-
-                age_code = guest_count.get('@AgeQualifyingCode', '')
-                try:
-                    count = int(guest_count.get('@Count', 1))
-                except (ValueError, TypeError):
-                    count = 1
-
-                if age_code in ['10', '1']:
-                    adults += count
-                elif age_code in ['8', '7', '2']:
-                    children += count
-                else:
-                    adults += count
-
-            if adults == 0:
-                adults = 1
-
-            # Extract room types
-            room_types_container = first_room_stay.get('RoomTypes', {})
-            room_types_data = room_types_container.get('RoomType', [])
-
-            if not isinstance(room_types_data, list):
-                room_types_data = [room_types_data]
-
-            room_types = []
-            for rt in room_types_data:
-                if not isinstance(rt, dict):
-                    continue
-
-                room_type_info = {
-                    'room_type_code': rt.get('@RoomTypeCode', ''),
-                    'room_type': rt.get('@RoomType', ''),
-                    'room_id': rt.get('@RoomID', '')
-                }
-
-                room_desc_container = rt.get('RoomDescription', {})
-                room_desc_text = room_desc_container.get('Text', '')
-
-                if isinstance(room_desc_text, dict):
-                    room_type_info['description'] = room_desc_text.get('#text', '')
-                else:
-                    room_type_info['description'] = room_desc_text
-
-                room_types.append(room_type_info)
+            dated_stays = [stay for stay in stays if stay['checkin_date'] and stay['checkout_date']] or stays
+            first_checkin = min(dated_stays, key=lambda stay: RoomStayExtractor._date_key(stay['checkin_date']))
+            last_checkout = max(dated_stays, key=lambda stay: RoomStayExtractor._date_key(stay['checkout_date']))
 
             return {
-                'checkin_date': checkin_date,
-                'checkout_date': checkout_date,
-                'adults': adults,
-                'children': children,
-                'room_types': room_types
+                'checkin_date': first_checkin['checkin_date'],
+                'checkout_date': last_checkout['checkout_date'],
+                'adults': sum(stay['adults'] for stay in stays),
+                'children': sum(stay['children'] for stay in stays),
+                'room_types': [room_type for stay in stays for room_type in stay['room_types']],
+                'room_stays': stays
             }
 
         except Exception as e:
             return None
+
+    @staticmethod
+    def _date_key(date_string):
+        parsed = DateTimeHelper.parse_date(date_string)
+        return (parsed is None, parsed or date_string)
+
+    @staticmethod
+    def _extract_single_room_stay(room_stay):
+        fields = _ROOM_STAY_FIELDS(room_stay)
+        checkin_date = fields['checkin_date']
+        checkout_date = fields['checkout_date']
+
+        adults = children = 0
+
+        for guest_count in fields['guest_counts']:
+            if guest_count.__class__ is not dict:
+                continue
+
+            guest_count = _GUEST_COUNT_FIELDS(guest_count)
+            try:
+                count = int(guest_count['count'])
+            except (ValueError, TypeError):
+                count = 1
+
+            if guest_count['age_code'] in ['10', '1']:
+                adults += count
+            elif guest_count['age_code'] in ['8', '7', '2']:
+                children += count
+            else:
+                adults += count
+
+        if adults == 0:
+            adults = 1
+
+        room_types = []
+        for rt in fields['room_types']:
+            if rt.__class__ is not dict:
+                continue
+
+            room_type_info = _ROOM_TYPE_FIELDS(rt)
+            room_type_info['checkin_date'] = checkin_date
+            room_type_info['checkout_date'] = checkout_date
+            room_types.append(room_type_info)
+
+        return {
+            'checkin_date': checkin_date,
+            'checkout_date': checkout_date,
+            'adults': adults,
+            'children': children,
+            'room_types': room_types
+        }
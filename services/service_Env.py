@@ -0,0 +1,28 @@
+import threading
+from contextlib import contextmanager
+
+from odoo.http import request
+
+_local = threading.local()
+
+
+def get_env():
+    """Environment the reservation services run in.
+
+    Inside an HTTP request this is ``request.env``; background workers bind
+    their own environment with :func:`use_env`.
+    """
+    env = getattr(_local, "env", None)
+    if env is not None:
+        return env
+    return request.env
+
+
+@contextmanager
+def use_env(env):
+    previous = getattr(_local, "env", None)
+    _local.env = env
+    try:
+        yield env
+    finally:
+        _local.env = previous
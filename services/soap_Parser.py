@@ -0,0 +1,104 @@
+import io
+import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+
+WSSE_NS = "http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd"
+OTA_REQUEST_TAG = "OTA_HotelResNotifRQ"
+
+PARSER_ENGINE_PARAM = "psn_api.soap_parser_engine"
+
+
+def _split_tag(tag):
+    if tag[:1] == "{":
+        ns, local = tag[1:].split("}", 1)
+        return ns, local
+    return None, tag
+
+
+class SoapParsingEngine:
+    """Single streaming pass over a SiteMinder SOAP message.
+
+    Collects the wsse:Password, the EchoToken and the OTA_HotelResNotifRQ
+    payload while walking the bytes once. The payload is built in the same
+    shape xmltodict produces (``@attr``, ``#text``, repeated tags as lists)
+    so the extractors keep working on it unchanged.
+    """
+
+    ENGINES = ("etree", "lxml")
+
+    def __init__(self, engine="etree"):
+        if engine == "lxml" and lxml_etree is None:
+            engine = "etree"
+        self.engine = engine if engine in self.ENGINES else "etree"
+
+    def _iterparse(self, source):
+        events = ("start", "end")
+        if self.engine == "lxml":
+            return lxml_etree.iterparse(source, events=events, resolve_entities=False, no_network=True)
+        return ET.iterparse(source, events=events)
+
+    def _parse_errors(self):
+        if self.engine == "lxml":
+            return (ET.ParseError, lxml_etree.XMLSyntaxError)
+        return (ET.ParseError,)
+
+    def parse(self, xml_data):
+        if isinstance(xml_data, str):
+            xml_data = xml_data.encode("utf-8")
+
+        api_key = None
+        echo_token = None
+        ota_request = None
+        stack = []
+
+        try:
+            for event, elem in self._iterparse(io.BytesIO(xml_data)):
+                if event == "start":
+                    if echo_token is None:
+                        echo_token = elem.get("EchoToken")
+                    if stack or _split_tag(elem.tag)[1] == OTA_REQUEST_TAG:
+                        stack.append({
+                            "@" + _split_tag(name)[1]: value for name, value in elem.attrib.items()
+                        })
+                    continue
+
+                ns, local = _split_tag(elem.tag)
+                if ns == WSSE_NS and local == "Password" and api_key is None and elem.text:
+                    api_key = elem.text.strip() or None
+
+                if not stack:
+                    continue
+
+                node = stack.pop()
+                text = elem.text.strip() if elem.text else ""
+                if node:
+                    if text:
+                        node["#text"] = text
+                    value = node
+                else:
+                    value = text or None
+
+                if not stack:
+                    ota_request = value or {}
+                else:
+                    parent = stack[-1]
+                    if local not in parent:
+                        parent[local] = value
+                    elif isinstance(parent[local], list):
+                        parent[local].append(value)
+                    else:
+                        parent[local] = [parent[local], value]
+                elem.clear()
+        except self._parse_errors():
+            return None
+
+        return {
+            "api_key": api_key,
+            "echo_token": echo_token,
+            "ota_request": ota_request,
+        }
@@ -1,28 +1,25 @@
-import xmltodict
+from .soap_Parser import SoapParsingEngine
 
 
 class XmlParsingService:
 
 
     @staticmethod
-    def parse_hotel_reservation_xml(xml_data):
+    def parse_soap_message(xml_data, engine="etree"):
 
-        try:
-            xml_dict = xmltodict.parse(xml_data)
-
-            return xml_dict
-        except Exception as e:
-
-            return {}
+        return SoapParsingEngine(engine).parse(xml_data)
 
     @staticmethod
-    def extract_reservation_data(xml_dict):
+    def extract_reservations_data(xml_dict):
 
         try:
 
-            soap_envelope = xml_dict.get('soap-env:Envelope', {})
-            soap_body = soap_envelope.get('soap-env:Body', {})
-            ota_request = soap_body.get('OTA_HotelResNotifRQ', {})
+            if 'ota_request' in xml_dict:
+                ota_request = xml_dict.get('ota_request') or {}
+            else:
+                soap_envelope = xml_dict.get('soap-env:Envelope', {})
+                soap_body = soap_envelope.get('soap-env:Body', {})
+                ota_request = soap_body.get('OTA_HotelResNotifRQ', {})
 
             if not ota_request:
                 raise ValueError("No OTA_HotelResNotifRQ found in XML")
@@ -36,8 +33,8 @@ class XmlParsingService:
             if not hotel_reservations:
                 raise ValueError("No hotel reservations found in XML")
 
-            return hotel_reservations[0]
+            return hotel_reservations
 
         except Exception as e:
 
-            raise
\ No newline at end of file
+            raise